@@ -0,0 +1,45 @@
+# Copyright (c) 2025, ahmadmohammad96 and contributors
+# For license information, please see license.txt
+
+import click
+from frappe.commands import get_site, pass_context
+
+
+@click.command("export-selected-fixtures")
+@click.option("--docname", help="Only export the selection stored by this Export Customizations Module")
+@click.option("--timeout", type=int, help="Time budget in seconds, unless set in site config")
+@pass_context
+def export_selected_fixtures(context, docname=None, timeout=None):
+	"""Export the fixtures of export_import_app, including the selections stored by exports
+
+	The export runs in this process within the time and memory budget of the
+	site (export_fixtures_time_budget, export_fixtures_memory_budget_mb).
+	"""
+	import frappe
+	from export_import_app.export_import_app.doctype.export_customizations_module.budget import (
+		ExportBudgetExceeded,
+	)
+	from export_import_app.export_import_app.doctype.export_customizations_module.export_log import (
+		flush_export_log,
+		start_export_log,
+	)
+	from export_import_app.export_import_app.doctype.export_customizations_module.test import (
+		export_stored_fixtures,
+	)
+
+	site = get_site(context)
+	frappe.init(site=site)
+	frappe.connect()
+	start_export_log()
+	try:
+		manifest = export_stored_fixtures(docname, timeout)
+		click.echo(f"Exported {len(manifest.get_files())} fixture files")
+	except ExportBudgetExceeded as e:
+		click.secho(f"Export stopped: {e}", fg="red")
+		raise SystemExit(1)
+	finally:
+		flush_export_log()
+		frappe.destroy()
+
+
+commands = [export_selected_fixtures]
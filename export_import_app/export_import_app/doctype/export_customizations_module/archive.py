@@ -0,0 +1,99 @@
+# Copyright (c) 2025, ahmadmohammad96 and contributors
+# For license information, please see license.txt
+
+import os
+import shutil
+import zipfile
+
+import frappe
+
+
+def get_private_file_path(filename):
+	"""Return a path in the site's private files store that is not taken yet"""
+	files_path = frappe.get_site_path("private", "files")
+	os.makedirs(files_path, exist_ok=True)
+
+	base, ext = os.path.splitext(filename)
+	filepath = os.path.join(files_path, filename)
+	counter = 1
+	while os.path.exists(filepath):
+		filepath = os.path.join(files_path, f"{base}_{counter}{ext}")
+		counter += 1
+
+	return filepath
+
+
+def write_zip_archive(zip_filepath, members, compression=zipfile.ZIP_STORED):
+	"""Write files into a ZIP archive on disk
+
+	Members are copied from disk in chunks by zipfile, so memory use does not
+	depend on the size of the files or of the archive.
+
+	Args:
+		zip_filepath (str): Archive to create
+		members (iterable): (filepath, arcname) pairs
+		compression (int): zipfile compression constant
+
+	Returns:
+		str: zip_filepath
+	"""
+	with zipfile.ZipFile(zip_filepath, "w", compression) as zipf:
+		for filepath, arcname in members:
+			zipf.write(filepath, arcname=arcname)
+
+	return zip_filepath
+
+
+def attach_private_file(filepath, attached_to_doctype, attached_to_name, folder=None, file_name=None):
+	"""Create a File record for a file that already exists in private/files
+
+	The File points at the file on disk through its URL, so the content is
+	neither read back nor written a second time.
+
+	Args:
+		file_name (str): Name of the File, if not the name of the file on disk
+
+	Returns:
+		Document: The inserted File
+	"""
+	file_doc = frappe.get_doc({
+		"doctype": "File",
+		"file_name": file_name or os.path.basename(filepath),
+		"file_url": f"/private/files/{os.path.basename(filepath)}",
+		"file_size": os.path.getsize(filepath),
+		"attached_to_doctype": attached_to_doctype,
+		"attached_to_name": attached_to_name,
+		"is_private": 1
+	})
+	if folder:
+		file_doc.folder = folder
+
+	file_doc.insert(ignore_permissions=True)
+	return file_doc
+
+
+def attach_private_files(members, attached_to_doctype, attached_to_name, folder="Home/Attachments"):
+	"""Copy files into private/files and attach each of them with attach_private_file
+
+	Files are copied on disk, not read into memory. Every File is inserted
+	as a document, so its validation (content hash, size, folder) runs.
+
+	Args:
+		members (iterable): (filepath, file_name) pairs
+		attached_to_doctype (str): DocType the files are attached to
+		attached_to_name (str): Document the files are attached to
+		folder (str): File folder
+
+	Returns:
+		list: frappe._dict(name, file_name, file_url) per file, in order
+	"""
+	files = []
+
+	for filepath, file_name in members:
+		target_path = get_private_file_path(file_name)
+		shutil.copyfile(filepath, target_path)
+
+		file_doc = attach_private_file(target_path, attached_to_doctype, attached_to_name, folder, file_name)
+		files.append(frappe._dict({"name": file_doc.name, "file_name": file_name, "file_url": file_doc.file_url}))
+
+	return files
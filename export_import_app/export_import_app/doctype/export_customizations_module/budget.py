@@ -0,0 +1,53 @@
+# Copyright (c) 2025, ahmadmohammad96 and contributors
+# For license information, please see license.txt
+
+import time
+
+import frappe
+import psutil
+
+# Defaults, overridable per site with export_fixtures_time_budget (seconds)
+# and export_fixtures_memory_budget_mb in site_config.json
+DEFAULT_TIME_BUDGET = 300
+DEFAULT_MEMORY_BUDGET_MB = 512
+
+
+class ExportBudgetExceeded(frappe.ValidationError):
+	pass
+
+
+class ExportBudget:
+	"""Time and memory limits of an in-process export, enforced cooperatively
+
+	The export calls check() between units of work (e.g. pages of records),
+	so it stops at a consistent point instead of being killed from outside.
+	Memory is measured as the growth of the process RSS since the budget was
+	created.
+	"""
+
+	def __init__(self, seconds=None, memory_mb=None):
+		self.seconds = seconds
+		self.memory_mb = memory_mb
+		self._started = time.monotonic()
+		self._process = psutil.Process() if memory_mb else None
+		self._base_rss = self._process.memory_info().rss if self._process else 0
+
+	@classmethod
+	def from_site_config(cls, seconds=None):
+		"""Build the budget from site config, falling back to seconds and the defaults"""
+		return cls(
+			seconds=frappe.conf.get("export_fixtures_time_budget") or seconds or DEFAULT_TIME_BUDGET,
+			memory_mb=frappe.conf.get("export_fixtures_memory_budget_mb") or DEFAULT_MEMORY_BUDGET_MB
+		)
+
+	def check(self, context=None):
+		"""Raise ExportBudgetExceeded once the time or memory budget is used up"""
+		suffix = f" while exporting {context}" if context else ""
+
+		if self.seconds and time.monotonic() - self._started > self.seconds:
+			raise ExportBudgetExceeded(f"Export time budget of {self.seconds}s exceeded{suffix}")
+
+		if self._process:
+			used_mb = (self._process.memory_info().rss - self._base_rss) / (1024 * 1024)
+			if used_mb > self.memory_mb:
+				raise ExportBudgetExceeded(f"Export memory budget of {self.memory_mb} MB exceeded{suffix}")
@@ -0,0 +1,81 @@
+# Copyright (c) 2025, ahmadmohammad96 and contributors
+# For license information, please see license.txt
+
+import json
+import os
+import time
+
+# Saved next to the partial data file, e.g. fixtures/my_doctype.json.checkpoint
+CHECKPOINT_SUFFIX = ".checkpoint"
+# Records written between two checkpoints
+EXPORT_CHECKPOINT_INTERVAL = 1000
+# Older checkpoints are discarded and the export starts over
+CHECKPOINT_MAX_AGE = 24 * 60 * 60
+
+
+class ExportCheckpoint:
+	"""Progress of a paginated data export, persisted next to its partial file
+
+	Holds the DocType (and filters) being exported, the name of the last
+	record written and the byte offset and record count of the partial file
+	at that point. Records are exported in name order, so a retried job can
+	truncate the file to the offset and continue after the last name.
+	"""
+
+	def __init__(self, filepath, doctype, filters=None):
+		self.filepath = filepath
+		self.path = filepath + CHECKPOINT_SUFFIX
+		self.doctype = doctype
+		self.filters = json.dumps(filters, sort_keys=True, default=str) if filters else None
+		self.last_name = None
+		self.offset = 0
+		self.count = 0
+
+	def load(self):
+		"""Restore the saved progress; returns False when there is nothing to resume"""
+		try:
+			with open(self.path) as f:
+				data = json.load(f)
+		except (OSError, ValueError):
+			return False
+
+		if (
+			data.get("doctype") != self.doctype
+			or data.get("filters") != self.filters
+			or time.time() - data.get("saved_at", 0) > CHECKPOINT_MAX_AGE
+			or not os.path.exists(self.filepath)
+			or os.path.getsize(self.filepath) < data.get("offset", 0)
+		):
+			# Stale or for another export - start over
+			self.clear()
+			return False
+
+		self.last_name = data["last_name"]
+		self.offset = data["offset"]
+		self.count = data["count"]
+		return True
+
+	def save(self, last_name, offset, count):
+		"""Persist the progress; the partial file must be flushed up to offset"""
+		self.last_name = last_name
+		self.offset = offset
+		self.count = count
+
+		data = {
+			"doctype": self.doctype,
+			"filters": self.filters,
+			"last_name": last_name,
+			"offset": offset,
+			"count": count,
+			"saved_at": time.time()
+		}
+		# Replace atomically, so a job killed while saving keeps the previous checkpoint
+		tmp_path = self.path + ".tmp"
+		with open(tmp_path, "w") as f:
+			json.dump(data, f)
+		os.replace(tmp_path, self.path)
+
+	def clear(self):
+		"""Remove the checkpoint once the export is complete"""
+		if os.path.exists(self.path):
+			os.remove(self.path)
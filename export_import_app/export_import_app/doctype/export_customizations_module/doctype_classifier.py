@@ -0,0 +1,73 @@
+# Copyright (c) 2025, ahmadmohammad96 and contributors
+# For license information, please see license.txt
+
+import frappe
+
+# Cache key of the DocType name -> is custom map, per site
+DOCTYPE_CLASSIFICATION_CACHE_KEY = "export_import_app:doctype_classification"
+
+# Modules shipped by the core apps
+CORE_MODULES = frozenset([
+	# Frappe core modules
+	"Core", "Website", "Workflow", "Email", "Custom", "Geo", "Desk",
+	"Integrations", "Printing", "Contacts", "Social", "Automation",
+
+	# ERPNext core modules
+	"Accounts", "CRM", "Buying", "Projects", "Selling", "Setup",
+	"Manufacturing", "Stock", "Support", "Utilities", "Assets",
+	"Portal", "Maintenance", "Regional", "ERPNext Integrations",
+	"Quality Management", "Communication", "Telephony", "Bulk Transaction",
+	"Subcontracting", "EDI",
+
+	# HRMS core modules
+	"HR", "Payroll"
+])
+CORE_APPS = frozenset(["frappe", "erpnext", "hrms"])
+
+
+def is_custom_doctype(doctype_name):
+	"""Return True for a custom (user-created) DocType, False for a core one
+
+	A DocType is custom when its custom flag is set, when its module is not
+	a core module, or when its module belongs to an app other than the core
+	apps (including an empty app_name). Unknown DocTypes, and DocTypes of a
+	core module without a Module Def, are treated as core.
+	"""
+	return get_doctype_classification().get(doctype_name, False)
+
+
+def get_doctype_classification():
+	"""Return the DocType name -> is custom map, cached per site"""
+	return frappe.cache().get_value(DOCTYPE_CLASSIFICATION_CACHE_KEY, generator=build_doctype_classification)
+
+
+def build_doctype_classification():
+	"""Classify every DocType with a single query over DocType and Module Def"""
+	rows = frappe.db.sql(
+		"""
+		SELECT dt.name, dt.custom, dt.module, md.name AS module_def, md.app_name
+		FROM `tabDocType` dt
+		LEFT JOIN `tabModule Def` md ON md.name = dt.module
+		""",
+		as_dict=True
+	)
+
+	classification = {}
+	for row in rows:
+		if row.custom:
+			classification[row.name] = True
+		elif row.module not in CORE_MODULES:
+			classification[row.name] = True
+		elif row.module_def is None:
+			# A core module without a Module Def cannot be placed, keep it as core
+			classification[row.name] = False
+		else:
+			# An empty app_name is not a core app, so the DocType counts as custom
+			classification[row.name] = row.app_name not in CORE_APPS
+
+	return classification
+
+
+def clear_doctype_classification_cache(doc=None, method=None):
+	"""Drop the cached classification when a DocType or Module Def changes"""
+	frappe.cache().delete_value(DOCTYPE_CLASSIFICATION_CACHE_KEY)
@@ -35,17 +35,16 @@ frappe.ui.form.on('Export Customizations Module', {
                 frappe.confirm(
                     __('Are you sure you want to export the selected customizations?'),
                     function() {
-                        // Yes callback - directly call export function since doc is already saved
+                        // Yes callback - queue the export, progress arrives over realtime
                         frm.call({
                             method: 'export_import_app.export_import_app.doctype.export_customizations_module.export_customizations_module.export_customizations',
                             args: {
                                 docname: frm.doc.name
                             },
-                            freeze: true,
-                            freeze_message: __('Exporting customizations...'),
                             callback: function(r) {
-                                // Refresh the form to show updated status
-                                frm.reload_doc();
+                                if (r.message) {
+                                    frappe.show_alert({message: __(r.message), indicator: 'blue'});
+                                }
                             }
                         });
                     },
@@ -77,6 +76,12 @@ frappe.ui.form.on('Export Customizations Module', {
         
         // Set indicator color based on export status
         set_status_indicator(frm);
+        
+        // Listen for progress pushed by the background export job
+        listen_for_export_progress(frm);
+        
+        // Show where the last export spent its time
+        render_export_profile(frm);
     },
     
     all_client_scripts: function(frm) {
@@ -137,6 +142,9 @@ function set_status_indicator(frm) {
         case 'Completed with warnings':
             statusIndicator = 'yellow';
             break;
+        case 'Partial':
+            statusIndicator = 'orange';
+            break;
         case 'Failed':
             statusIndicator = 'red';
             break;
@@ -145,4 +153,75 @@ function set_status_indicator(frm) {
     }
     
     frm.set_indicator(frm.doc.export_status, statusIndicator);
-}
\ No newline at end of file
+}
+
+// Helper function to follow a running export through realtime updates
+function listen_for_export_progress(frm) {
+    frappe.realtime.off('export_customizations_progress');
+    frappe.realtime.on('export_customizations_progress', function(data) {
+        if (data.docname !== frm.doc.name) {
+            return;
+        }
+        
+        if (data.progress !== null && data.progress !== undefined) {
+            frm.dashboard.show_progress(__('Export'), data.progress, __(data.export_message || ''));
+        }
+        
+        if (data.progress === 100) {
+            frm.dashboard.hide_progress();
+            frm.reload_doc();
+        } else {
+            frm.doc.export_status = data.export_status;
+            frm.doc.export_message = data.export_message;
+            frm.refresh_field('export_message');
+            set_status_indicator(frm);
+        }
+    });
+}
+
+// Helper function to show the per-stage timings stored in last_export_result
+function render_export_profile(frm) {
+    let wrapper = frm.get_field('export_profile_html').$wrapper;
+    let profile = null;
+    
+    try {
+        profile = JSON.parse(frm.doc.last_export_result || '{}').profile;
+    } catch (e) {
+        profile = null;
+    }
+    
+    if (!profile || !profile.stages || !profile.stages.length) {
+        wrapper.empty();
+        return;
+    }
+    
+    let rows = profile.stages.map(function(stage) {
+        return `<tr>
+            <td>${frappe.utils.escape_html(stage.stage)}</td>
+            <td class="text-right">${stage.seconds.toFixed(3)}</td>
+            <td class="text-right">${stage.queries == null ? '-' : stage.queries}</td>
+            <td class="text-right">${stage.rows}</td>
+            <td class="text-right">${frappe.form.formatters.Int(stage.bytes)}</td>
+        </tr>`;
+    }).join('');
+    
+    wrapper.html(`<table class="table table-bordered table-condensed">
+        <thead>
+            <tr>
+                <th>${__('Stage')}</th>
+                <th class="text-right">${__('Seconds')}</th>
+                <th class="text-right">${__('Queries')}</th>
+                <th class="text-right">${__('Rows')}</th>
+                <th class="text-right">${__('Bytes')}</th>
+            </tr>
+        </thead>
+        <tbody>${rows}</tbody>
+        <tfoot>
+            <tr>
+                <th>${__('Total')}</th>
+                <th class="text-right">${profile.total_seconds.toFixed(3)}</th>
+                <th colspan="3"></th>
+            </tr>
+        </tfoot>
+    </table>`);
+}
@@ -15,11 +15,31 @@ class ExportCustomizationsModule(Document):
 import frappe
 import os
 import json
-import zipfile
 import shutil
+import hashlib
+from export_import_app import __version__
 from frappe.model.document import Document
-from frappe.utils import now_datetime, get_datetime, cint
-from frappe.utils.file_manager import save_file
+from frappe.utils import now_datetime, get_datetime, cint, time_diff_in_seconds
+from export_import_app.export_import_app.doctype.export_customizations_module.archive import (
+	attach_private_file,
+	get_private_file_path,
+	write_zip_archive,
+)
+from export_import_app.export_import_app.doctype.export_customizations_module.export_mail import (
+	get_export_email_content,
+	get_links_html,
+)
+from export_import_app.export_import_app.doctype.export_customizations_module.fixture_selection import save_fixture_selection
+from export_import_app.export_import_app.doctype.export_customizations_module.instrumentation import ExportProfile
+from export_import_app.export_import_app.doctype.export_customizations_module.json_stream import (
+	WRITE_BUFFER_SIZE,
+	write_json_records,
+)
+from export_import_app.export_import_app.doctype.export_customizations_module.parallel import map_with_site_connections
+
+# Realtime event used to push export progress to the open form
+EXPORT_PROGRESS_EVENT = "export_customizations_progress"
+EXPORT_JOB_TIMEOUT = 3600
 
 class ExportCustomizationsModule(Document):
 	def validate(self):
@@ -49,44 +69,297 @@ class CustomizationExporter:
 		
 		self.exported_files = []
 		self.export_timestamp = now_datetime().strftime("%Y%m%d%H%M%S")
+		self._export_plan = None
+		self._previous_watermarks = None
+		self.export_errors = []
+		self.new_watermarks = {}
+		self.profile = ExportProfile()
+
+	def get_export_plan(self):
+		"""Load everything the DocType stages need in a fixed number of queries
+
+		The plan is built once per export and shared by export_doctypes,
+		create_fixtures_config and update_hooks_fixtures, so the number of
+		queries does not grow with the number of selected DocTypes.
+
+		Returns:
+			frappe._dict: doctype_names (list), doctypes (name -> row),
+				custom_doctypes (list), custom_fields (dt -> rows) and
+				property_setters (doc_type -> rows)
+		"""
+		if self._export_plan is not None:
+			return self._export_plan
+
+		doctype_names = []
+		for dt_row in self.doc.export_doctypes:
+			if dt_row.doctype_name and dt_row.doctype_name not in doctype_names:
+				doctype_names.append(dt_row.doctype_name)
+
+		plan = frappe._dict({
+			"doctype_names": doctype_names,
+			"doctypes": {},
+			"custom_doctypes": [],
+			"custom_fields": {},
+			"property_setters": {}
+		})
+
+		if doctype_names:
+			for row in frappe.get_all(
+				"DocType",
+				filters={"name": ["in", doctype_names]},
+				fields=["name", "custom", "modified"]
+			):
+				plan.doctypes[row.name] = row
+			self._track_watermark("DocType", plan.doctypes.values())
+
+			plan.custom_doctypes = [
+				name for name in doctype_names
+				if name in plan.doctypes and cint(plan.doctypes[name].custom) == 1
+			]
+
+			custom_fields = frappe.get_all(
+				"Custom Field",
+				filters={"dt": ["in", doctype_names], **self.get_delta_filters("Custom Field")},
+				fields=["*"]
+			)
+			for cf in custom_fields:
+				plan.custom_fields.setdefault(cf.dt, []).append(cf)
+			self._track_watermark("Custom Field", custom_fields)
+
+			property_setters = frappe.get_all(
+				"Property Setter",
+				filters={"doc_type": ["in", doctype_names], **self.get_delta_filters("Property Setter")},
+				fields=["*"]
+			)
+			for ps in property_setters:
+				plan.property_setters.setdefault(ps.doc_type, []).append(ps)
+			self._track_watermark("Property Setter", property_setters)
+
+		self._export_plan = plan
+		return plan
+
+	def get_selection(self):
+		"""Return the normalised export selection of the document"""
+		return {
+			"doctypes": sorted({row.doctype_name for row in self.doc.export_doctypes if row.doctype_name}),
+			"all_client_scripts": cint(self.doc.all_client_scripts),
+			"client_scripts": sorted({row.client_script_name for row in self.doc.export_client_scripts if row.client_script_name}),
+			"all_server_scripts": cint(self.doc.all_server_scripts),
+			"server_scripts": sorted({row.server_script_name for row in self.doc.export_server_scripts if row.server_script_name})
+		}
+	
+	def get_selection_key(self):
+		"""Hash of the selection, used to tie watermarks to what they were recorded for"""
+		return hashlib.sha256(json.dumps(self.get_selection(), sort_keys=True).encode()).hexdigest()
+	
+	def get_previous_watermarks(self):
+		"""Return the watermarks a delta export can start from
+		
+		Watermarks are only usable in Delta mode and when they were recorded
+		for the same selection; otherwise the export falls back to a full one.
+		
+		Returns:
+			dict or None: {"types": {doctype: modified}, "deleted": creation}
+		"""
+		if self._previous_watermarks is None:
+			watermarks = {}
+			if self.doc.export_mode == "Delta" and self.doc.export_watermarks:
+				try:
+					stored = json.loads(self.doc.export_watermarks)
+					if stored.get("selection") == self.get_selection_key():
+						watermarks = stored
+				except ValueError:
+					pass
+			self._previous_watermarks = watermarks
+		
+		return self._previous_watermarks or None
+	
+	def is_delta_export(self):
+		return bool(self.get_previous_watermarks())
+	
+	def get_delta_filters(self, doctype):
+		"""Filters restricting a query to rows changed since the previous export
+		
+		The watermark is the newest modified timestamp the previous export
+		read, and another row can be saved with that same timestamp after the
+		read. The comparison is inclusive so such a row is not lost; the rows
+		at the watermark are exported again, which the importer applies as a
+		no-op update.
+		"""
+		watermarks = self.get_previous_watermarks()
+		since = watermarks and watermarks.get("types", {}).get(doctype)
+		return {"modified": [">=", since]} if since else {}
+	
+	def _track_watermark(self, doctype, rows):
+		"""Advance the high-water modified timestamp recorded for doctype"""
+		for row in rows:
+			modified = row.get("modified")
+			if modified and (doctype not in self.new_watermarks or get_datetime(modified) > get_datetime(self.new_watermarks[doctype])):
+				self.new_watermarks[doctype] = str(modified)
+	
+	def get_deleted_records(self):
+		"""Names deleted since the previous export, grouped by customization type"""
+		watermarks = self.get_previous_watermarks()
+		if not watermarks or not watermarks.get("deleted"):
+			return {}
+		
+		selection = self.get_selection()
+		doctype_names = set(selection["doctypes"])
+		deleted = {}
+		
+		for row in frappe.get_all(
+			"Deleted Document",
+			filters={
+				"deleted_doctype": ["in", ["DocType", "Custom Field", "Property Setter", "Client Script", "Server Script"]],
+				"creation": [">=", watermarks["deleted"]]
+			},
+			fields=["deleted_doctype", "deleted_name", "data"],
+			order_by="creation asc"
+		):
+			if row.deleted_doctype == "DocType":
+				keep = row.deleted_name in doctype_names
+			elif row.deleted_doctype in ("Custom Field", "Property Setter"):
+				try:
+					data = json.loads(row.data or "{}")
+				except ValueError:
+					data = {}
+				keep = (data.get("dt") or data.get("doc_type")) in doctype_names
+			elif row.deleted_doctype == "Client Script":
+				keep = selection["all_client_scripts"] or row.deleted_name in selection["client_scripts"]
+			else:
+				keep = selection["all_server_scripts"] or row.deleted_name in selection["server_scripts"]
 			
-	def update_status(self, status, message=""):
-		"""Update the export status and message"""
-		self.doc.export_status = status
+			# A name deleted more than once has several tombstones; list it once
+			if keep and row.deleted_name not in deleted.setdefault(row.deleted_doctype, []):
+				deleted[row.deleted_doctype].append(row.deleted_name)
+		
+		return deleted
+	
+	def export_deleted_records(self):
+		"""Write the tombstone list of a delta export"""
+		if not self.is_delta_export():
+			return
+		
+		self._write_json_file("deleted_records.json", {
+			"since": self.get_previous_watermarks()["deleted"],
+			"records": self.get_deleted_records()
+		}, is_document=False)
+	
+	def get_export_fingerprint(self):
+		"""Fingerprint the selection and the rows it would export
+		
+		Uses one count/max(modified) query per customization type, so it is
+		cheap compared to an export. Counting catches deleted rows, which do
+		not move max(modified).
+		
+		Returns:
+			str: SHA-256 hex digest
+		"""
+		selection = self.get_selection()
+		doctype_names = selection["doctypes"]
+		client_script_names = selection["client_scripts"]
+		server_script_names = selection["server_scripts"]
+		
+		def summarize(doctype, filters):
+			row = frappe.get_all(
+				doctype,
+				filters=filters,
+				fields=["count(name) as count", "max(modified) as modified"]
+			)[0]
+			return [row.count, row.modified]
+		
+		parts = dict(selection, version=__version__)
+		
+		if doctype_names:
+			parts["DocType"] = summarize("DocType", {"name": ["in", doctype_names]})
+			parts["Custom Field"] = summarize("Custom Field", {"dt": ["in", doctype_names]})
+			parts["Property Setter"] = summarize("Property Setter", {"doc_type": ["in", doctype_names]})
+		
+		if selection["all_client_scripts"]:
+			parts["Client Script"] = summarize("Client Script", {})
+		elif client_script_names:
+			parts["Client Script"] = summarize("Client Script", {"name": ["in", client_script_names]})
+		
+		if selection["all_server_scripts"]:
+			parts["Server Script"] = summarize("Server Script", {})
+		elif server_script_names:
+			parts["Server Script"] = summarize("Server Script", {"name": ["in", server_script_names]})
+		
+		return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+	
+	def get_reusable_export_file(self, fingerprint):
+		"""Return the last export's File if it was built from the same fingerprint"""
+		if not self.doc.last_export_file or self.doc.last_export_fingerprint != fingerprint:
+			return None
+		
+		file_url = frappe.db.get_value("File", self.doc.last_export_file, "file_url")
+		if not file_url or not os.path.isfile(frappe.get_site_path(file_url.lstrip("/"))):
+			return None
+		
+		return frappe.get_doc("File", self.doc.last_export_file)
+	
+	def update_status(self, status, message="", progress=None):
+		"""Update the export status and message
+		
+		Writes only the status columns (no full document save) and pushes the
+		update to the open form through frappe.publish_realtime.
+		"""
+		values = {
+			"export_status": status,
+			"last_export_update": now_datetime()
+		}
 		if message:
-			self.doc.export_message = message
-		self.doc.last_export_update = now_datetime()
-		self.doc.save(ignore_permissions=True)
+			values["export_message"] = message
+		
+		self.doc.update(values)
+		frappe.db.set_value(self.doc.doctype, self.doc.name, values, update_modified=False)
 		frappe.db.commit()
+		
+		frappe.publish_realtime(
+			EXPORT_PROGRESS_EVENT,
+			{
+				"docname": self.doc.name,
+				"export_status": status,
+				"export_message": self.doc.export_message,
+				"progress": progress
+			},
+			doctype=self.doc.doctype,
+			docname=self.doc.name
+		)
 	
-	def _write_json_file(self, filename, data, is_document=True):
+	def _write_json_file(self, filename, data, is_document=True, exported_files=None):
 		"""Write data to a JSON file
 		
+		Lists and other iterables are streamed record by record, so passing a
+		generator keeps memory flat regardless of the number of records.
+		
 		Args:
 			filename (str): The name of the file
-			data (dict or list): The data to write
+			data (dict, list or iterable): The data to write
 			is_document (bool): Whether this is a document file (to be imported)
 								or a config file (for reference only)
+			exported_files (list): Where to record the written file, defaults
+								to self.exported_files
 		"""
 		# Choose the appropriate directory based on file type
 		base_path = self.fixtures_path if is_document else self.config_path
 		filepath = os.path.join(base_path, filename)
 		
 		try:
-			# Validate documents have the required doctype field
-			if is_document:
-				if isinstance(data, dict):
-					if "doctype" not in data:
-						frappe.throw(f"Missing 'doctype' field in export data for {filename}")
-				elif isinstance(data, list):
-					for i, item in enumerate(data):
-						if isinstance(item, dict) and "doctype" not in item:
-							frappe.throw(f"Missing 'doctype' field in export data item {i} for {filename}")
-			
-			with open(filepath, 'w') as f:
-				json.dump(data, f, indent=4, default=str)
+			if isinstance(data, dict):
+				# Validate documents have the required doctype field
+				if is_document and "doctype" not in data:
+					frappe.throw(f"Missing 'doctype' field in export data for {filename}")
+				
+				with open(filepath, 'w', buffering=WRITE_BUFFER_SIZE) as f:
+					json.dump(data, f, indent=4, default=str)
+				rows = 1
+			else:
+				records = self._validate_records(data, filename) if is_document else data
+				rows = write_json_records(filepath, records)
 			
-			self.exported_files.append({
+			self.profile.record(rows=rows, bytes=os.path.getsize(filepath))
+			(self.exported_files if exported_files is None else exported_files).append({
 				"filename": filename,
 				"filepath": filepath,
 				"is_document": is_document
@@ -94,149 +367,172 @@ class CustomizationExporter:
 			
 			return filepath
 		except Exception as e:
+			# Do not leave a half-written file behind for the ZIP stage
+			if os.path.isfile(filepath):
+				os.remove(filepath)
 			frappe.log_error(f"Error writing to file {filename}: {str(e)}", "Customization Export")
+			self.export_errors.append(f"Error writing to file {filename}: {str(e)}")
 			return None
 	
+	def _validate_records(self, records, filename):
+		"""Yield records, ensuring each one has the doctype field required for import"""
+		for i, item in enumerate(records):
+			if isinstance(item, dict) and "doctype" not in item:
+				frappe.throw(f"Missing 'doctype' field in export data item {i} for {filename}")
+			yield item
+	
 	def export_doctypes(self):
 		"""Export selected doctypes including their structure"""
-		self.update_status("In Progress", "Exporting DocTypes...")
+		self.update_status("In Progress", "Exporting DocTypes...", progress=10)
 		
-		for dt_row in self.doc.export_doctypes:
-			doctype_name = dt_row.doctype_name
-			try:
-				# Get doctype definition
-				doctype = frappe.get_doc("DocType", doctype_name)
-				
-				# Check if this is a core doctype or custom doctype
-				is_core_doctype = cint(doctype.custom) == 0
-				
-				if not is_core_doctype:
-					# Only export full definition for custom doctypes
-					doctype_data = doctype.as_dict()
-					
-					# Remove unnecessary fields
-					for field in ["creation", "modified", "modified_by", "owner", "docstatus"]:
-						if field in doctype_data:
-							del doctype_data[field]
-					
-					# Ensure doctype field is present (required for import)
-					if "doctype" not in doctype_data:
-						doctype_data["doctype"] = "DocType"
-					
-					# Export the doctype definition
-					self._write_json_file(f"doctype_{doctype_name.lower().replace(' ', '_')}.json", doctype_data)
-				
-				# Export custom fields for this doctype
-				self._export_custom_fields_for_doctype(doctype_name)
-				
-				# Export property setters for this doctype
-				self._export_property_setters_for_doctype(doctype_name)
-				
-			except Exception as e:
-				frappe.log_error(f"Error exporting doctype {doctype_name}: {str(e)}", "Customization Export")
-				self.update_status("Completed with warnings", f"Error exporting doctype {doctype_name}: {str(e)}")
-	
-	def _export_custom_fields_for_doctype(self, doctype_name):
-		"""Export custom fields for a specific doctype"""
-		custom_fields = frappe.get_all(
-			"Custom Field",
-			filters={"dt": doctype_name},
-			fields=["*"]
+		plan = self.get_export_plan()
+		
+		# DocTypes write independent files, so they can be exported on parallel workers
+		results = map_with_site_connections(
+			self._export_doctype,
+			plan.doctype_names,
+			cint(self.doc.export_workers) or 1,
+			self.profile
 		)
 		
-		if custom_fields:
-			formatted_custom_fields = []
-			for cf in custom_fields:
+		# Merge in selection order so the output does not depend on worker timing
+		for doctype_name, result in zip(plan.doctype_names, results):
+			self.exported_files.extend(result.files)
+			
+			if result.error:
+				frappe.log_error(f"Error exporting doctype {doctype_name}: {result.error}", "Customization Export")
+				self.export_errors.append(f"Error exporting doctype {doctype_name}: {result.error}")
+				self.update_status("Completed with warnings", f"Error exporting doctype {doctype_name}: {result.error}")
+	
+	def _export_doctype(self, doctype_name):
+		"""Export the definition, custom fields and property setters of one doctype
+		
+		Runs on export workers, so it reports its files and error back
+		instead of recording them on the exporter.
+		
+		Returns:
+			frappe._dict: files (list of exported file info) and error (str or None)
+		"""
+		result = frappe._dict({"files": [], "error": None})
+		plan = self.get_export_plan()
+		
+		try:
+			if doctype_name not in plan.doctypes:
+				frappe.throw(f"DocType {doctype_name} not found")
+			
+			# Only export full definition for custom doctypes (changed ones in delta mode)
+			since = self.get_delta_filters("DocType").get("modified")
+			if doctype_name in plan.custom_doctypes and (
+				not since or get_datetime(plan.doctypes[doctype_name].modified) >= get_datetime(since[1])
+			):
+				doctype_data = frappe.get_doc("DocType", doctype_name).as_dict()
+				
 				# Remove unnecessary fields
 				for field in ["creation", "modified", "modified_by", "owner", "docstatus"]:
-					if field in cf:
-						del cf[field]
+					if field in doctype_data:
+						del doctype_data[field]
 				
 				# Ensure doctype field is present (required for import)
-				cf["doctype"] = "Custom Field"
-				formatted_custom_fields.append(cf)
+				if "doctype" not in doctype_data:
+					doctype_data["doctype"] = "DocType"
+				
+				# Export the doctype definition
+				self._write_json_file(
+					f"doctype_{doctype_name.lower().replace(' ', '_')}.json",
+					doctype_data,
+					exported_files=result.files
+				)
+			
+			# Export custom fields for this doctype
+			self._export_custom_fields_for_doctype(doctype_name, exported_files=result.files)
+			
+			# Export property setters for this doctype
+			self._export_property_setters_for_doctype(doctype_name, exported_files=result.files)
 			
-			self._write_json_file(f"custom_fields_{doctype_name.lower().replace(' ', '_')}.json", formatted_custom_fields)
+		except Exception as e:
+			result.error = str(e)
+		
+		return result
 	
-	def _export_property_setters_for_doctype(self, doctype_name):
+	def _export_custom_fields_for_doctype(self, doctype_name, exported_files=None):
+		"""Export custom fields for a specific doctype"""
+		custom_fields = self.get_export_plan().custom_fields.get(doctype_name)
+		
+		if custom_fields:
+			self._write_json_file(
+				f"custom_fields_{doctype_name.lower().replace(' ', '_')}.json",
+				self._format_records(custom_fields, "Custom Field"),
+				exported_files=exported_files
+			)
+	
+	def _export_property_setters_for_doctype(self, doctype_name, exported_files=None):
 		"""Export property setters for a specific doctype"""
-		property_setters = frappe.get_all(
-			"Property Setter",
-			filters={"doc_type": doctype_name},
-			fields=["*"]
-		)
+		property_setters = self.get_export_plan().property_setters.get(doctype_name)
 		
 		if property_setters:
-			formatted_property_setters = []
-			for ps in property_setters:
-				# Remove unnecessary fields
-				for field in ["creation", "modified", "modified_by", "owner", "docstatus"]:
-					if field in ps:
-						del ps[field]
-				
-				# Ensure doctype field is present (required for import)
-				ps["doctype"] = "Property Setter"
-				formatted_property_setters.append(ps)
+			self._write_json_file(
+				f"property_setter_{doctype_name.lower().replace(' ', '_')}.json",
+				self._format_records(property_setters, "Property Setter"),
+				exported_files=exported_files
+			)
+	
+	def _format_records(self, records, doctype):
+		"""Yield export-ready copies of records without the system fields"""
+		for record in records:
+			# Copy so the shared plan rows stay untouched
+			record = frappe._dict(record)
 			
-			self._write_json_file(f"property_setter_{doctype_name.lower().replace(' ', '_')}.json", formatted_property_setters)
+			# Remove unnecessary fields
+			for field in ["creation", "modified", "modified_by", "owner", "docstatus"]:
+				if field in record:
+					del record[field]
+			
+			# Ensure doctype field is present (required for import)
+			record["doctype"] = doctype
+			yield record
 	
 	def export_client_scripts(self):
 		"""Export selected client scripts"""
-		self.update_status("In Progress", "Exporting Client Scripts...")
-		
-		client_scripts = []
+		self.update_status("In Progress", "Exporting Client Scripts...", progress=40)
 		
-		# If "All Client Scripts" is checked, get all client scripts
-		if cint(self.doc.all_client_scripts):
-			client_scripts = frappe.get_all("Client Script", fields=["*"])
-		else:
-			# Get only selected client scripts
-			for cs_row in self.doc.export_client_scripts:
-				cs = frappe.get_doc("Client Script", cs_row.client_script_name)
-				client_scripts.append(cs.as_dict())
+		client_scripts = self._get_script_rows(
+			"Client Script",
+			cint(self.doc.all_client_scripts),
+			[cs_row.client_script_name for cs_row in self.doc.export_client_scripts]
+		)
 		
 		if client_scripts:
-			formatted_client_scripts = []
-			for cs in client_scripts:
-				# Remove unnecessary fields
-				for field in ["creation", "modified", "modified_by", "owner", "docstatus"]:
-					if field in cs:
-						del cs[field]
-				
-				# Ensure doctype field is present (required for import)
-				cs["doctype"] = "Client Script"
-				formatted_client_scripts.append(cs)
-			
-			self._write_json_file("client_scripts.json", formatted_client_scripts)
+			self._write_json_file("client_scripts.json", self._format_records(client_scripts, "Client Script"))
 	
 	def export_server_scripts(self):
 		"""Export selected server scripts"""
-		self.update_status("In Progress", "Exporting Server Scripts...")
+		self.update_status("In Progress", "Exporting Server Scripts...", progress=55)
 		
-		server_scripts = []
+		server_scripts = self._get_script_rows(
+			"Server Script",
+			cint(self.doc.all_server_scripts),
+			[ss_row.server_script_name for ss_row in self.doc.export_server_scripts]
+		)
 		
-		# If "All Server Scripts" is checked, get all server scripts
-		if cint(self.doc.all_server_scripts):
-			server_scripts = frappe.get_all("Server Script", fields=["*"])
+		if server_scripts:
+			self._write_json_file("server_scripts.json", self._format_records(server_scripts, "Server Script"))
+	
+	def _get_script_rows(self, doctype, export_all, names):
+		"""Load the Client Script or Server Script rows to export"""
+		delta_filters = self.get_delta_filters(doctype)
+		
+		# If "All ... Scripts" is checked, get all scripts
+		if export_all:
+			rows = frappe.get_all(doctype, filters=delta_filters, fields=["*"])
+		elif delta_filters:
+			# Only the selected scripts changed since the previous export
+			rows = frappe.get_all(doctype, filters={"name": ["in", names], **delta_filters}, fields=["*"]) if names else []
 		else:
-			# Get only selected server scripts
-			for ss_row in self.doc.export_server_scripts:
-				ss = frappe.get_doc("Server Script", ss_row.server_script_name)
-				server_scripts.append(ss.as_dict())
+			# Get only selected scripts
+			rows = [frappe.get_doc(doctype, name).as_dict() for name in names]
 		
-		if server_scripts:
-			formatted_server_scripts = []
-			for ss in server_scripts:
-				# Remove unnecessary fields
-				for field in ["creation", "modified", "modified_by", "owner", "docstatus"]:
-					if field in ss:
-						del ss[field]
-				
-				# Ensure doctype field is present (required for import)
-				ss["doctype"] = "Server Script"
-				formatted_server_scripts.append(ss)
-			
-			self._write_json_file("server_scripts.json", formatted_server_scripts)
+		self._track_watermark(doctype, rows)
+		return rows
 	
 	def create_fixtures_config(self):
 		"""Create a fixtures configuration file to assist with imports"""
@@ -245,7 +541,8 @@ class CustomizationExporter:
 			"export_info": {
 				"app": "export_import_app",
 				"timestamp": self.export_timestamp,
-				"exported_by": frappe.session.user
+				"exported_by": frappe.session.user,
+				"mode": "Delta" if self.is_delta_export() else "Full"
 			},
 			"custom_doctypes": [],
 			"custom_fields": {},
@@ -253,20 +550,17 @@ class CustomizationExporter:
 		}
 		
 		# Add exported doctypes to configuration
-		for dt_row in self.doc.export_doctypes:
-			doctype_name = dt_row.doctype_name
-			doctype = frappe.get_doc("DocType", doctype_name)
-			
-			if cint(doctype.custom) == 1:
-				config["custom_doctypes"].append(doctype_name)
-			
+		plan = self.get_export_plan()
+		config["custom_doctypes"].extend(plan.custom_doctypes)
+		
+		for doctype_name in plan.doctype_names:
 			# Add custom fields
-			custom_fields = frappe.get_all("Custom Field", filters={"dt": doctype_name}, fields=["fieldname"])
+			custom_fields = plan.custom_fields.get(doctype_name)
 			if custom_fields:
 				config["custom_fields"][doctype_name] = [cf.fieldname for cf in custom_fields]
 			
 			# Add property setters
-			property_setters = frappe.get_all("Property Setter", filters={"doc_type": doctype_name}, fields=["property"])
+			property_setters = plan.property_setters.get(doctype_name)
 			if property_setters:
 				config["property_setters"][doctype_name] = [ps.property for ps in property_setters]
 		
@@ -274,53 +568,36 @@ class CustomizationExporter:
 		self._write_json_file("export_references.json", config, is_document=False)
 	
 	def update_hooks_fixtures(self):
-		"""Generate hooks.py fixtures configuration for easier imports"""
+		"""Generate hooks.py fixtures configuration for easier imports
+		
+		The configuration is stored on the document for get_fixtures and
+		written to a reference hooks_template.py; the app's hooks.py is not touched.
+		"""
 		
 		# Create a fixtures configuration based on exported files
 		fixtures_config = []
 		
-		# First add custom doctypes
-		custom_doctypes = []
-		for dt_row in self.doc.export_doctypes:
-			doctype_name = dt_row.doctype_name
-			try:
-				doctype = frappe.get_doc("DocType", doctype_name)
-				if cint(doctype.custom) == 1:
-					custom_doctypes.append(doctype_name)
-			except Exception:
-				continue
+		plan = self.get_export_plan()
 		
-		# Add custom doctypes as direct strings
-		fixtures_config.extend(custom_doctypes)
+		# First add custom doctypes as direct strings
+		fixtures_config.extend(plan.custom_doctypes)
 		
 		# Add custom fields configuration
-		doctype_fields = {}
-		for dt_row in self.doc.export_doctypes:
-			doctype_name = dt_row.doctype_name
-			custom_fields = frappe.get_all("Custom Field", filters={"dt": doctype_name})
-			if custom_fields:
-				if doctype_name not in doctype_fields:
-					doctype_fields[doctype_name] = []
+		doctype_fields = [name for name in plan.doctype_names if plan.custom_fields.get(name)]
 		
 		if doctype_fields:
 			fixtures_config.append({
 				"dt": "Custom Field",
-				"filters": [["dt", "in", list(doctype_fields.keys())]]
+				"filters": [["dt", "in", doctype_fields]]
 			})
 		
 		# Add property setter configuration
-		doctype_props = {}
-		for dt_row in self.doc.export_doctypes:
-			doctype_name = dt_row.doctype_name
-			property_setters = frappe.get_all("Property Setter", filters={"doc_type": doctype_name})
-			if property_setters:
-				if doctype_name not in doctype_props:
-					doctype_props[doctype_name] = []
+		doctype_props = [name for name in plan.doctype_names if plan.property_setters.get(name)]
 		
 		if doctype_props:
 			fixtures_config.append({
 				"dt": "Property Setter",
-				"filters": [["doc_type", "in", list(doctype_props.keys())]]
+				"filters": [["doc_type", "in", doctype_props]]
 			})
 		
 		# Add client scripts configuration
@@ -337,6 +614,9 @@ class CustomizationExporter:
 				"filters": []
 			})
 		
+		# Keep the selection in the database, where export-selected-fixtures reads it
+		save_fixture_selection(self.doc.name, fixtures_config)
+		
 		# Create a hooks.py sample file
 		hooks_content = f"""
 # Fixtures Configuration for export_import_app
@@ -380,34 +660,27 @@ fixtures = {json.dumps(fixtures_config, indent=4, default=str)}
 	
 	def attach_files_to_doc(self):
 		"""Attach the exported files to the document"""
-		self.update_status("In Progress", "Attaching files to document...")
+		self.update_status("In Progress", "Attaching files to document...", progress=75)
 		
-		# Create a timestamped ZIP filename for record-keeping
-		zip_filename = f"customization_export_{self.export_timestamp}.zip"
-		zip_filepath = os.path.join(frappe.get_site_path("private", "files"), zip_filename)
+		# Create a timestamped ZIP filename for record-keeping, directly in the private files store
+		prefix = "customization_delta" if self.is_delta_export() else "customization_export"
+		zip_filepath = get_private_file_path(f"{prefix}_{self.export_timestamp}.zip")
 		
 		# Create a zip file of all exported files
-		with zipfile.ZipFile(zip_filepath, 'w') as zipf:
+		members = []
+		for file_info in self.exported_files:
 			# Add all files (both documents and configs)
-			for file_info in self.exported_files:
-				folder = "fixtures" if file_info.get("is_document", True) else "config"
-				zipf.write(
-					file_info["filepath"], 
-					arcname=f"{folder}/{os.path.basename(file_info['filepath'])}"
-				)
+			folder = "fixtures" if file_info.get("is_document", True) else "config"
+			members.append((file_info["filepath"], f"{folder}/{os.path.basename(file_info['filepath'])}"))
 		
-		# Attach the zip file to the document
-		file_doc = save_file(
-			zip_filename,
-			open(zip_filepath, 'rb').read(),
-			"Export Customizations Module",
-			self.doc.name,
-			is_private=1
-		)
+		write_zip_archive(zip_filepath, members)
+		self.profile.record(rows=len(members), bytes=os.path.getsize(zip_filepath))
+		
+		# Attach the zip file to the document without reading it back
+		file_doc = attach_private_file(zip_filepath, "Export Customizations Module", self.doc.name)
 		
 		# Update the last export file field
-		self.doc.last_export_file = file_doc.name
-		self.doc.save(ignore_permissions=True)
+		self.doc.db_set("last_export_file", file_doc.name, update_modified=False)
 		
 		return file_doc
 	def send_emails(self, file_doc):
@@ -415,52 +688,88 @@ fixtures = {json.dumps(fixtures_config, indent=4, default=str)}
 		if not self.doc.emails or len(self.doc.emails) == 0:
 			return
 			
-		self.update_status("In Progress", "Sending emails...")
+		self.update_status("In Progress", "Sending emails...", progress=90)
 		
 		recipient_emails = [row.email for row in self.doc.emails if row.email]
 		
 		if not recipient_emails:
 			return
 			
-		attachments = [{
-			"fname": file_doc.file_name,
-			"fcontent": file_doc.get_content()
-		}]
-		
-		for email in recipient_emails:
-			try:
-				frappe.sendmail(
-					recipients=[email],
-					subject=f"ERPNext Customization Export - {self.export_timestamp}",
-					message=f"Please find attached the customization export files generated on {self.doc.last_export_update}.",
-					attachments=attachments
-				)
-			except Exception as e:
-				frappe.log_error(f"Error sending email to {email}: {str(e)}", "Customization Export")
+		# One queued email for all recipients; the archive is attached by File
+		# reference, or linked when it is above the attachment limit
+		attachments, links = get_export_email_content([file_doc], self.doc.email_attachment_limit)
+		
+		if attachments:
+			message = f"Please find attached the customization export files generated on {self.doc.last_export_update}."
+		else:
+			message = f"The customization export files generated on {self.doc.last_export_update} are ready to download."
+		
+		try:
+			frappe.sendmail(
+				recipients=recipient_emails,
+				subject=f"ERPNext Customization Export - {self.export_timestamp}",
+				message=message + get_links_html(links),
+				attachments=attachments
+			)
+			self.profile.record(rows=len(recipient_emails))
+		except Exception as e:
+			frappe.log_error(f"Error sending email to {', '.join(recipient_emails)}: {str(e)}", "Customization Export")
 			
 
 	def export_all(self):
 		"""Run the complete export process"""
 		try:
-			self.update_status("Starting", "Starting export process...")
+			self.update_status("Starting", "Starting export process...", progress=0)
+			
+			# Reuse the last archive when nothing it was built from has changed.
+			# A delta archive is never reused: with no changes the next delta is empty.
+			with self.profile.stage("fingerprint"):
+				fingerprint = self.get_export_fingerprint()
+				file_doc = None if self.doc.export_mode == "Delta" else self.get_reusable_export_file(fingerprint)
+			if file_doc:
+				with self.profile.stage("email"):
+					self.send_emails(file_doc)
+				
+				message = f"No changes since the last export. Reusing {file_doc.file_name}."
+				self.doc.db_set("last_export_result", json.dumps({
+					"reused_file": file_doc.file_name,
+					"profile": self.profile.as_dict()
+				}, indent=4, default=str), update_modified=False)
+				self.update_status("Completed", message, progress=100)
+				return message
 			
-			# Clear previous fixture files
-			self.clear_previous_fixtures()
+			with self.profile.stage("clear_fixtures"):
+				# Deletions are recorded from here on, so take the tombstone watermark first
+				deleted_watermark = frappe.get_all(
+					"Deleted Document",
+					fields=["max(creation) as creation"]
+				)[0].creation or now_datetime()
+				
+				# Clear previous fixture files
+				self.clear_previous_fixtures()
 			
 			# Export the selected items
-			self.export_doctypes()
-			self.export_client_scripts()
-			self.export_server_scripts()
+			with self.profile.stage("doctypes"):
+				self.export_doctypes()
+			with self.profile.stage("client_scripts"):
+				self.export_client_scripts()
+			with self.profile.stage("server_scripts"):
+				self.export_server_scripts()
+			with self.profile.stage("deleted_records"):
+				self.export_deleted_records()
 			
 			# Create configuration files
-			self.create_fixtures_config()
-			self.update_hooks_fixtures()
+			with self.profile.stage("config"):
+				self.create_fixtures_config()
+				self.update_hooks_fixtures()
 			
 			# Attach files to the document
-			file_doc = self.attach_files_to_doc()
+			with self.profile.stage("archive"):
+				file_doc = self.attach_files_to_doc()
 			
 			# Send emails if recipients are specified
-			self.send_emails(file_doc)
+			with self.profile.stage("email"):
+				self.send_emails(file_doc)
 			
 			# Count exported files
 			doc_files = sum(1 for f in self.exported_files if f.get("is_document", True))
@@ -470,17 +779,41 @@ fixtures = {json.dumps(fixtures_config, indent=4, default=str)}
 			result = {
 				"document_files": [f["filename"] for f in self.exported_files if f.get("is_document", True)],
 				"config_files": [f["filename"] for f in self.exported_files if not f.get("is_document", True)],
-				"timestamp": self.export_timestamp
+				"timestamp": self.export_timestamp,
+				"mode": "Delta" if self.is_delta_export() else "Full"
+			}
+			if self.is_delta_export():
+				result["since"] = self.get_previous_watermarks()
+			result["profile"] = self.profile.as_dict()
+			
+			values = {
+				"last_export_result": json.dumps(result, indent=4, default=str),
+				# Only a complete, full export may be reused by later runs
+				"last_export_fingerprint": None if self.export_errors or self.is_delta_export() else fingerprint
 			}
 			
-			self.doc.last_export_result = json.dumps(result, indent=4)
-			self.update_status("Completed", f"Export completed successfully. {doc_files} document files and {config_files} config files exported.")
+			# Only a complete export may move the watermarks forward
+			if not self.export_errors:
+				previous = self.get_previous_watermarks() or {}
+				values["export_watermarks"] = json.dumps({
+					"selection": self.get_selection_key(),
+					"types": dict(previous.get("types", {}), **self.new_watermarks),
+					"deleted": str(deleted_watermark)
+				}, indent=4)
+			
+			self.doc.db_set(values, update_modified=False)
+			self.update_status("Completed", f"Export completed successfully. {doc_files} document files and {config_files} config files exported.", progress=100)
 			
 			return f"Export completed successfully. {doc_files} document files and {config_files} config files exported."
 			
 		except Exception as e:
 			frappe.log_error(f"Export failed: {str(e)}", "Customization Export")
-			self.update_status("Failed", f"Export failed: {str(e)}")
+			# Keep the timings of the stages that ran, to see where the export stopped
+			self.doc.db_set("last_export_result", json.dumps({
+				"error": str(e),
+				"profile": self.profile.as_dict()
+			}, indent=4, default=str), update_modified=False)
+			self.update_status("Failed", f"Export failed: {str(e)}", progress=100)
 			return f"Export failed: {str(e)}"
 
 @frappe.whitelist()
@@ -505,17 +838,36 @@ def export_customizations(docname):
 			frappe.msgprint("Nothing selected to export. Please select at least one doctype, client script, or server script.")
 			return "Nothing to export"
 		
-		exporter = CustomizationExporter(doc)
-		result = exporter.export_all()
+		# Ignore a stale "running" status left behind by a killed worker
+		if doc.export_status in ("Starting", "In Progress") and doc.last_export_update and \
+		time_diff_in_seconds(now_datetime(), doc.last_export_update) < EXPORT_JOB_TIMEOUT:
+			frappe.msgprint("An export is already running for this document.")
+			return "Export already running"
+		
+		# Mark as queued before the job starts so the form shows it immediately
+		CustomizationExporter(doc).update_status("Starting", "Export queued...", progress=0)
+		
+		frappe.enqueue(
+			run_export,
+			queue="long",
+			timeout=EXPORT_JOB_TIMEOUT,
+			job_name=f"export_customizations_{docname}",
+			enqueue_after_commit=True,
+			docname=docname
+		)
 		
-		frappe.msgprint(result)
-		return result
+		return "Export started in background"
 		
 	except Exception as e:
 		frappe.log_error(f"Export customizations failed: {str(e)}", "Customization Export")
 		frappe.msgprint(f"Export failed: {str(e)}")
 		return f"Export failed: {str(e)}"
 
+def run_export(docname):
+	"""Background job entry point for export_customizations"""
+	doc = frappe.get_doc("Export Customizations Module", docname)
+	return CustomizationExporter(doc).export_all()
+
 @frappe.whitelist()
 def get_doctypes_list():
 	"""Get a list of non-custom doctypes for the selection field"""
@@ -0,0 +1,92 @@
+# Copyright (c) 2025, ahmadmohammad96 and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.utils import add_to_date, cint, get_datetime, get_url, now_datetime
+from frappe.utils.verified_command import get_signed_params, verify_request
+
+# Exports up to this size are attached, larger ones are sent as a download link
+DEFAULT_ATTACHMENT_LIMIT_MB = 10
+# Lifetime of the download links sent instead of attachments
+EXPORT_LINK_EXPIRY_HOURS = 72
+
+
+def get_attachment_limit(limit_mb=None):
+	"""Return the attachment size limit in bytes, falling back to the default when unset
+
+	An explicit 0 sends every file as a link.
+	"""
+	if limit_mb is None or limit_mb == "":
+		limit_mb = DEFAULT_ATTACHMENT_LIMIT_MB
+	return cint(limit_mb) * 1024 * 1024
+
+
+def get_export_download_url(file_name, expiry_hours=EXPORT_LINK_EXPIRY_HOURS):
+	"""Return a signed URL that downloads a private File until it expires"""
+	expires = add_to_date(now_datetime(), hours=expiry_hours).strftime("%Y-%m-%d %H:%M:%S")
+	params = get_signed_params({"file": file_name, "expires": expires})
+	return get_url(
+		"/api/method/export_import_app.export_import_app.doctype.export_customizations_module.export_mail.download_export_file?"
+		+ params
+	)
+
+
+def get_export_email_content(file_docs, limit_mb=None):
+	"""Split exported files into email attachments and download links
+
+	Attachments are passed to frappe.sendmail by File reference ("fid"), so the
+	Email Queue stores a pointer instead of a copy of the content. Files above
+	the size limit, or whatever would push the total over it, become links.
+
+	Args:
+		file_docs (list): File documents to send
+		limit_mb (int): Size limit for attachments in MB
+
+	Returns:
+		tuple: (attachments, links) where links is a list of (file_name, url)
+	"""
+	limit = get_attachment_limit(limit_mb)
+	attachments, links = [], []
+	total_size = 0
+
+	for file_doc in file_docs:
+		file_size = cint(file_doc.file_size)
+		if limit and total_size + file_size <= limit:
+			attachments.append({"fid": file_doc.name})
+			total_size += file_size
+		else:
+			links.append((file_doc.file_name, get_export_download_url(file_doc.name)))
+
+	return attachments, links
+
+
+def get_links_html(links):
+	"""Render download links for the email body"""
+	if not links:
+		return ""
+
+	items = "".join(
+		f'<li><a href="{url}">{frappe.utils.escape_html(file_name)}</a></li>' for file_name, url in links
+	)
+	return (
+		f"<p>The following files are too large to attach. "
+		f"The download links expire in {EXPORT_LINK_EXPIRY_HOURS} hours:</p><ul>{items}</ul>"
+	)
+
+
+@frappe.whitelist(allow_guest=True)
+def download_export_file(file, expires):
+	"""Download an export File through a signed, expiring link"""
+	if not verify_request():
+		return
+
+	if get_datetime(expires) < now_datetime():
+		frappe.throw("This download link has expired.", frappe.PermissionError)
+
+	file_doc = frappe.get_doc("File", file)
+	if file_doc.attached_to_doctype != "Export Customizations Module":
+		frappe.throw("This file cannot be downloaded through an export link.", frappe.PermissionError)
+
+	frappe.local.response.filename = file_doc.file_name
+	frappe.local.response.filecontent = file_doc.get_content()
+	frappe.local.response.type = "download"
@@ -0,0 +1,144 @@
+# Copyright (c) 2025, ahmadmohammad96 and contributors
+# For license information, please see license.txt
+
+import json
+
+import frappe
+
+APP_NAME = "export_import_app"
+
+
+def get_fixture_selection(export_doc):
+	"""Build the fixtures entries (hooks.py format) for an export selection
+
+	Args:
+		export_doc (dict or Document): Export Customizations Module values
+
+	Returns:
+		list: DocType names and {"dt": ..., "filters": ...} entries
+	"""
+	fixtures = []
+
+	# Add DocTypes from export_doctypes
+	doctype_names = [d.get("doctype_name") for d in export_doc.get("export_doctypes") or [] if d.get("doctype_name")]
+	fixtures.extend(doctype_names)
+
+	# Add Custom Fields and Property Setters for these doctypes, one entry
+	# each since every entry is exported to the same file
+	if doctype_names:
+		fixtures.append({
+			"dt": "Custom Field",
+			"filters": [["dt", "in", doctype_names]]
+		})
+		fixtures.append({
+			"dt": "Property Setter",
+			"filters": [["doc_type", "in", doctype_names]]
+		})
+
+	# Add Client Scripts
+	if export_doc.get("all_client_scripts"):
+		fixtures.append("Client Script")
+	else:
+		client_script_names = [c.get("client_script_name") for c in export_doc.get("export_client_scripts") or [] if c.get("client_script_name")]
+		if client_script_names:
+			fixtures.append({
+				"dt": "Client Script",
+				"filters": [["name", "in", client_script_names]]
+			})
+
+	# Add Server Scripts
+	if export_doc.get("all_server_scripts"):
+		fixtures.append("Server Script")
+	else:
+		server_script_names = [s.get("server_script_name") for s in export_doc.get("export_server_scripts") or [] if s.get("server_script_name")]
+		if server_script_names:
+			fixtures.append({
+				"dt": "Server Script",
+				"filters": [["name", "in", server_script_names]]
+			})
+
+	return fixtures
+
+
+def save_fixture_selection(docname, fixtures):
+	"""Store the fixtures entries of an export on its document, in place of hooks.py"""
+	frappe.db.set_value(
+		"Export Customizations Module",
+		docname,
+		"fixture_selection",
+		json.dumps(fixtures, indent=4),
+		update_modified=False
+	)
+
+
+def get_stored_selection(docname):
+	"""Return the fixtures entries stored by the last export of a document"""
+	selection = frappe.db.get_value("Export Customizations Module", docname, "fixture_selection")
+	return json.loads(selection) if selection else []
+
+
+def get_fixtures():
+	"""Return the fixtures of this app
+
+	The static list from hooks.py, followed by the selections stored on every
+	Export Customizations Module, merged into one entry per DocType.
+	"""
+	fixtures = list(frappe.get_hooks("fixtures", app_name=APP_NAME))
+
+	selections = frappe.get_all(
+		"Export Customizations Module",
+		filters={"fixture_selection": ["is", "set"]},
+		pluck="fixture_selection",
+		order_by="creation asc"
+	)
+	for selection in selections:
+		fixtures.extend(json.loads(selection))
+
+	return merge_fixtures(fixtures)
+
+
+def merge_fixtures(fixtures):
+	"""Merge fixtures entries of the same DocType, since each DocType is exported to one file
+
+	A plain DocType name covers all its records. Entries filtering the same
+	field with "=" or "in" are combined into one "in" filter; any other
+	entry replaces the previous one, as it would overwrite its file.
+	"""
+	merged = {}
+
+	for fixture in fixtures:
+		if isinstance(fixture, str):
+			merged[fixture] = fixture
+			continue
+
+		doctype = fixture.get("doctype") or fixture.get("dt")
+		current = merged.get(doctype)
+		if isinstance(current, str):
+			continue
+
+		current_filter = _get_in_filter(current) if current else None
+		new_filter = _get_in_filter(fixture)
+		if current_filter and new_filter and current_filter[0] == new_filter[0]:
+			values = current_filter[1] + [value for value in new_filter[1] if value not in current_filter[1]]
+			merged[doctype] = {"dt": doctype, "filters": [[new_filter[0], "in", values]]}
+		else:
+			merged[doctype] = fixture
+
+	return list(merged.values())
+
+
+def _get_in_filter(fixture):
+	"""Return (field, values) for an entry with a single "=" or "in" filter, else None"""
+	filters = fixture.get("filters")
+	if fixture.get("or_filters") or not filters or len(filters) != 1:
+		return None
+
+	condition = filters[0]
+	if isinstance(condition, dict) or len(condition) != 3 or condition[1] not in ("=", "in"):
+		return None
+
+	field, operator, value = condition
+	if operator == "=":
+		return field, [value]
+	return field, list(value) if isinstance(value, (list, tuple)) else [value]
+
@@ -0,0 +1,108 @@
+# Copyright (c) 2025, ahmadmohammad96 and contributors
+# For license information, please see license.txt
+
+import threading
+import time
+from contextlib import contextmanager
+
+import frappe
+from frappe.utils import cint
+
+
+def get_query_count():
+	"""Statements run so far on the current thread's connection, from the server's own counter
+
+	Returns:
+		int or None: None when the database has no per-session counter (e.g. Postgres)
+	"""
+	if not getattr(frappe.local, "db", None) or frappe.db.db_type != "mariadb":
+		return None
+
+	row = frappe.db.sql("SHOW SESSION STATUS LIKE 'Questions'")
+	return cint(row[0][1]) if row else None
+
+
+def count_queries_since(before):
+	"""Queries run since get_query_count() returned before, excluding the reads themselves"""
+	after = get_query_count()
+	if before is None or after is None:
+		return None
+	# The server counts the SHOW STATUS statement that reads the counter as well
+	return max(after - before - 1, 0)
+
+
+class ExportStage:
+	"""Wall time and counters of one stage of an export"""
+
+	def __init__(self, name):
+		self.name = name
+		self.seconds = 0.0
+		self.queries = 0
+		self.rows = 0
+		self.bytes = 0
+
+	def as_dict(self):
+		return {
+			"stage": self.name,
+			"seconds": round(self.seconds, 3),
+			"queries": self.queries,
+			"rows": self.rows,
+			"bytes": self.bytes
+		}
+
+
+class ExportProfile:
+	"""Per-stage timings of one export run
+
+	Usage:
+		profile = ExportProfile()
+		with profile.stage("doctypes"):
+			...
+			profile.record(rows=len(records), bytes=os.path.getsize(filepath))
+
+	Queries are read from the database's session counter before and after
+	each stage. Export workers run on their own connections, so they report
+	their queries, rows and bytes through record(), which may be called from
+	any thread (see parallel.map_with_site_connections).
+	"""
+
+	def __init__(self):
+		self.stages = []
+		self.current = None
+		self._lock = threading.Lock()
+		self._started = time.monotonic()
+
+	@contextmanager
+	def stage(self, name):
+		"""Time the enclosed block and count the queries it runs"""
+		stage = ExportStage(name)
+		self.stages.append(stage)
+		self.current = stage
+
+		queries_before = get_query_count()
+		start = time.monotonic()
+		try:
+			yield stage
+		finally:
+			stage.seconds = time.monotonic() - start
+			self.current = None
+
+			queries = count_queries_since(queries_before)
+			with self._lock:
+				# Unknown when the database has no session counter
+				stage.queries = None if queries is None else stage.queries + queries
+
+	def record(self, rows=0, bytes=0, queries=0):
+		"""Add processed rows, written bytes and queries run elsewhere to the running stage"""
+		with self._lock:
+			if self.current:
+				self.current.rows += rows
+				self.current.bytes += bytes
+				if queries:
+					self.current.queries += queries
+
+	def as_dict(self):
+		return {
+			"total_seconds": round(time.monotonic() - self._started, 3),
+			"stages": [stage.as_dict() for stage in self.stages]
+		}
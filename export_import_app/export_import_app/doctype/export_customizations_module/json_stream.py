@@ -0,0 +1,110 @@
+# Copyright (c) 2025, ahmadmohammad96 and contributors
+# For license information, please see license.txt
+
+import hashlib
+import json
+import os
+
+# Write buffer for fixture files, large enough to keep syscalls rare
+WRITE_BUFFER_SIZE = 64 * 1024
+
+
+class JSONArrayWriter:
+	"""Write a JSON array to a file one record at a time
+
+	The output is byte-for-byte identical to
+	json.dump(records, f, indent=indent, default=default, ensure_ascii=ensure_ascii),
+	but only the record being written is held in memory. A sha256 checksum of
+	the content is computed while writing, so it never has to be read back.
+
+	Passing the offset and count of a partial file written by an earlier
+	writer (see flush() and offset) truncates the file to that offset and
+	continues the same array after its last record.
+
+	Usage:
+		with JSONArrayWriter(filepath) as writer:
+			for record in records:
+				writer.write(record)
+	"""
+
+	def __init__(self, filepath, indent=4, default=str, ensure_ascii=True, encoding="utf-8", offset=0, count=0):
+		self.filepath = filepath
+		self.indent = indent
+		self.default = default
+		self.ensure_ascii = ensure_ascii
+		self.encoding = encoding
+		self.count = 0
+		# Bytes written so far, including a resumed prefix
+		self.offset = 0
+		self.checksum = None
+		self._hash = hashlib.sha256()
+		self._newline = "\n" + " " * indent
+
+		mode = "w"
+		if offset and count:
+			self._resume(offset, count)
+			mode = "a"
+		self._file = open(filepath, mode, encoding=encoding, buffering=WRITE_BUFFER_SIZE)
+
+	def write(self, record):
+		"""Encode a single record and append it to the array"""
+		encoded = json.dumps(
+			record,
+			indent=self.indent,
+			default=self.default,
+			ensure_ascii=self.ensure_ascii
+		)
+		# Newlines only occur between tokens, so re-indenting them nests the record one level
+		self._write(("[" if not self.count else ",") + self._newline)
+		self._write(encoded.replace("\n", self._newline))
+		self.count += 1
+
+	def flush(self):
+		"""Write buffered records to disk, so the file holds offset bytes"""
+		self._file.flush()
+
+	def close(self):
+		"""Terminate the array and close the file"""
+		if self._file.closed:
+			return
+		self._write("\n]" if self.count else "[]")
+		self._file.close()
+		self.checksum = self._hash.hexdigest()
+
+	def _write(self, text):
+		self._file.write(text)
+		encoded = text.encode(self.encoding)
+		self._hash.update(encoded)
+		self.offset += len(encoded)
+
+	def _resume(self, offset, count):
+		"""Drop whatever follows offset and hash the prefix being kept"""
+		os.truncate(self.filepath, offset)
+		with open(self.filepath, "rb") as f:
+			for chunk in iter(lambda: f.read(WRITE_BUFFER_SIZE), b""):
+				self._hash.update(chunk)
+		self.offset = offset
+		self.count = count
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+
+def write_json_records(filepath, records, **kwargs):
+	"""Stream an iterable of records to filepath as a JSON array
+
+	Args:
+		filepath (str): Destination file
+		records (iterable): Records to write; generators are consumed lazily
+		**kwargs: Passed through to JSONArrayWriter
+
+	Returns:
+		int: Number of records written
+	"""
+	with JSONArrayWriter(filepath, **kwargs) as writer:
+		for record in records:
+			writer.write(record)
+	return writer.count
@@ -0,0 +1,70 @@
+# Copyright (c) 2025, ahmadmohammad96 and contributors
+# For license information, please see license.txt
+
+import json
+import os
+import threading
+
+# Name of the manifest saved with the output of a fanned-out export part
+MANIFEST_FILE_NAME = "manifest"
+
+
+class ExportManifest:
+	"""Files written by an export job, recorded at the moment they are written
+
+	Every entry holds the path, size, record count and sha256 checksum of a
+	fixture file, so later stages can tell which files exist and whether they
+	are empty without reading them back from disk. Writing a path again
+	replaces its entry. Entries may be added from export worker threads.
+	"""
+
+	def __init__(self, entries=None):
+		self._entries = {}
+		self._lock = threading.Lock()
+		for entry in entries or []:
+			self._entries[entry["path"]] = entry
+
+	def add(self, path, count, checksum):
+		"""Record a file that has just been written"""
+		entry = {
+			"path": path,
+			"size": os.path.getsize(path),
+			"count": count,
+			"checksum": checksum
+		}
+		with self._lock:
+			self._entries[path] = entry
+		return entry
+
+	def add_writer(self, writer):
+		"""Record the file of a closed JSONArrayWriter"""
+		return self.add(writer.filepath, writer.count, writer.checksum)
+
+	def get(self, path):
+		return self._entries.get(path)
+
+	def add_entry(self, entry):
+		"""Record an entry taken from another manifest"""
+		with self._lock:
+			self._entries[entry["path"]] = entry
+		return entry
+
+	def get_entries(self):
+		return list(self._entries.values())
+
+	def get_files(self):
+		"""Paths of the files holding at least one record"""
+		return [entry["path"] for entry in self._entries.values() if entry["count"]]
+
+	def save(self, filepath):
+		with open(filepath, "w") as f:
+			json.dump(self.get_entries(), f, indent=4)
+
+	@classmethod
+	def load(cls, filepath):
+		"""Load a saved manifest, or return an empty one if there is none"""
+		if not os.path.exists(filepath):
+			return cls()
+
+		with open(filepath) as f:
+			return cls(json.load(f))
@@ -0,0 +1,67 @@
+# Copyright (c) 2025, ahmadmohammad96 and contributors
+# For license information, please see license.txt
+
+from concurrent.futures import ThreadPoolExecutor
+
+import frappe
+
+from export_import_app.export_import_app.doctype.export_customizations_module.export_log import (
+	get_export_log,
+	set_export_log,
+)
+from export_import_app.export_import_app.doctype.export_customizations_module.instrumentation import (
+	count_queries_since,
+	get_query_count,
+)
+
+# Upper bound for export_workers, each worker holds its own database connection
+MAX_EXPORT_WORKERS = 8
+
+
+def map_with_site_connections(func, items, max_workers=1, profile=None):
+	"""Call func(item) for every item on a bounded thread pool
+
+	Every worker thread initialises the current site and opens its own
+	database connection, so the calls run concurrently instead of sharing
+	the caller's connection. Workers commit what they wrote before
+	disconnecting, and log into the caller's export log buffer.
+
+	With max_workers <= 1 the calls run sequentially in the current thread.
+
+	Args:
+		func (callable): Function taking a single item
+		items (list): Items to process
+		max_workers (int): Maximum number of concurrent workers
+		profile (ExportProfile): If given, the queries each worker runs on its
+			own connection are added to the running stage
+
+	Returns:
+		list: Results in the order of items, independent of completion order
+	"""
+	items = list(items)
+	max_workers = min(max_workers or 1, MAX_EXPORT_WORKERS, len(items))
+	if max_workers <= 1:
+		return [func(item) for item in items]
+
+	site = frappe.local.site
+	sites_path = frappe.local.sites_path
+	user = frappe.session.user
+	export_log = get_export_log()
+
+	def run(item):
+		frappe.init(site=site, sites_path=sites_path)
+		try:
+			frappe.connect()
+			frappe.set_user(user)
+			set_export_log(export_log)
+			queries_before = get_query_count()
+			result = func(item)
+			frappe.db.commit()
+			if profile:
+				profile.record(queries=count_queries_since(queries_before) or 0)
+			return result
+		finally:
+			frappe.destroy()
+
+	with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="customization_export") as executor:
+		return list(executor.map(run, items))
@@ -113,6 +113,7 @@ frappe.ui.form.on('Export Customizations Module', {
             if (frm.doc.export_status === 'Completed') indicator = 'green';
             if (frm.doc.export_status === 'Failed') indicator = 'red';
             if (frm.doc.export_status === 'Completed with warnings') indicator = 'orange';
+            if (frm.doc.export_status === 'Partial') indicator = 'orange';
             
             frm.dashboard.add_indicator(
                 `${__('Export')}: ${__(frm.doc.export_status)} - ${frm.doc.export_message || ''}`,
@@ -168,6 +169,9 @@ frappe.ui.form.on('Export Customizations Module', {
             export_server_scripts: frm.doc.export_server_scripts || [],
             all_client_scripts: frm.doc.all_client_scripts || 0,
             all_server_scripts: frm.doc.all_server_scripts || 0,
+            export_workers: frm.doc.export_workers || 1,
+            email_attachment_limit: frm.doc.email_attachment_limit,
+            attach_individual_files: frm.doc.attach_individual_files,
             emails: frm.doc.emails || []
         };
         
@@ -217,7 +221,7 @@ frappe.ui.form.on('Export Customizations Module', {
                 // Update dialog to show that background process has started
                 frm.export_dialog.$body.html(`
                     <div class="export-progress">
-                        <p>${__('Export process started in background.')}</p>
+                        <p>${(r.message && r.message.message) || __('Export process started in background.')}</p>
                         <p>${__('Current Status')}: <span class="status-text">${__('Starting...')}</span></p>
                         <div class="progress" style="height: 10px;">
                             <div class="progress-bar" role="progressbar" style="width: 20%;" aria-valuenow="20" aria-valuemin="0" aria-valuemax="100"></div>
@@ -293,7 +297,7 @@ check_export_status: function(frm) {
                     } else if (status.export_status === 'Failed') {
                         progressPercent = 100;
                         alertClass = 'alert-danger';
-                    } else if (status.export_status === 'Completed with warnings') {
+                    } else if (status.export_status === 'Completed with warnings' || status.export_status === 'Partial') {
                         progressPercent = 100;
                         alertClass = 'alert-warning';
                     }
@@ -391,6 +395,7 @@ start_export: function(frm) {
         export_server_scripts: frm.doc.export_server_scripts || [],
         all_client_scripts: frm.doc.all_client_scripts || 0,
         all_server_scripts: frm.doc.all_server_scripts || 0,
+        export_workers: frm.doc.export_workers || 1,
         emails: frm.doc.emails || []
     };
     
@@ -443,7 +448,7 @@ start_export: function(frm) {
             // Update dialog to show that background process has started
             frm.export_dialog.$body.html(`
                 <div class="export-progress">
-                    <p>${__('Export process started in background.')}</p>
+                    <p>${(r.message && r.message.message) || __('Export process started in background.')}</p>
                     <p>${__('Current Status')}: <span class="status-text">${__('Starting...')}</span></p>
                     <div class="progress" style="height: 10px;">
                         <div class="progress-bar" role="progressbar" style="width: 20%;" aria-valuenow="20" aria-valuemin="0" aria-valuemax="100"></div>
@@ -10,15 +10,59 @@ class ExportCustomizationsModule(Document):
 
 import frappe
 import os
+import hashlib
 import json
-import subprocess
 import time
-import signal
-import re
-from frappe.utils import get_files_path, cstr, now, now_datetime
-from frappe.utils.file_manager import save_file
-from frappe.utils.background_jobs import enqueue
+from frappe.utils import get_files_path, cstr, cint, flt, now, now_datetime
+from frappe.utils.background_jobs import enqueue, is_job_enqueued
+from export_import_app.export_import_app.doctype.export_customizations_module import doctype_classifier
+from export_import_app.export_import_app.doctype.export_customizations_module.archive import (
+    attach_private_file,
+    attach_private_files,
+    get_private_file_path,
+    write_zip_archive,
+)
+from export_import_app.export_import_app.doctype.export_customizations_module.export_log import (
+    flush_export_log,
+    get_export_log,
+    start_export_log,
+    write_error_log,
+)
+from export_import_app.export_import_app.doctype.export_customizations_module.export_mail import get_export_email_content, get_links_html
+from export_import_app.export_import_app.doctype.export_customizations_module.budget import ExportBudget
+from export_import_app.export_import_app.doctype.export_customizations_module.checkpoint import (
+    EXPORT_CHECKPOINT_INTERVAL,
+    ExportCheckpoint,
+)
+from export_import_app.export_import_app.doctype.export_customizations_module.fixture_selection import (
+    APP_NAME,
+    get_fixture_selection,
+    get_fixtures,
+    get_stored_selection,
+    merge_fixtures,
+    save_fixture_selection,
+)
+from export_import_app.export_import_app.doctype.export_customizations_module.instrumentation import ExportProfile
+from export_import_app.export_import_app.doctype.export_customizations_module.json_stream import JSONArrayWriter
+from export_import_app.export_import_app.doctype.export_customizations_module.manifest import ExportManifest, MANIFEST_FILE_NAME
+from export_import_app.export_import_app.doctype.export_customizations_module.parallel import map_with_site_connections
 import sys
+import shutil
+import zipfile
+
+# Timeout of each fanned-out export job and of the finalising job
+EXPORT_PART_TIMEOUT = 1800
+# Fanned-out exports in progress (group_id -> group), watched by check_export_part_deadlines
+EXPORT_GROUPS_KEY = "customization_export_groups"
+# Number of parent records loaded per query when exporting DocType records
+EXPORT_PAGE_SIZE = 1000
+# Fixture files shared by all DocTypes, with the key their records are deduplicated by
+SHARED_FIXTURE_KEYS = {
+    "custom_field.json": lambda item: (item.get("dt"), item.get("fieldname")),
+    "property_setter.json": lambda item: (item.get("doc_type"), item.get("property")),
+    "client_script.json": lambda item: (item.get("dt"), item.get("name")),
+    "server_script.json": lambda item: item.get("name")
+}
 
 @frappe.whitelist()
 def export_customizations(doctype_name, export_doc):
@@ -30,6 +74,14 @@ def export_customizations(doctype_name, export_doc):
     try:
         export_doc = json.loads(export_doc)
         
+        # A repeated click or retry attaches to the identical export in progress
+        if not claim_export_job(doctype_name, export_doc):
+            return {
+                "message": "An identical export is already in progress, following its progress",
+                "background_job": True,
+                "attached": True
+            }
+        
         # Enqueue the actual export as a background job
         enqueue(
             execute_export_customizations,
@@ -47,6 +99,8 @@ def export_customizations(doctype_name, export_doc):
         }
     except Exception as e:
         frappe.log_error(title="Export Customizations Error", message=frappe.get_traceback())
+        if isinstance(export_doc, dict):
+            release_export_job(doctype_name, export_doc)
         frappe.throw(f"Error starting export process: {str(e)}")
 
 # Changes to execute_export_customizations for improved auto-saving
@@ -54,6 +108,8 @@ def execute_export_customizations(doctype_name, export_doc):
     """
     The actual export process that runs in the background
     """
+    start_export_log()
+    profile = ExportProfile()
     try:
         frappe.db.commit()  # To ensure we're working with a fresh transaction
         
@@ -70,45 +126,62 @@ def execute_export_customizations(doctype_name, export_doc):
         if not app_info:
             update_export_status(doctype_name, "Failed", "Could not determine app to update")
             frappe.db.commit()
+            release_export_job(doctype_name, export_doc)
             return
         
-        # Update status - Updating hooks
-        update_export_status(doctype_name, "In Progress", "Updating hooks.py with fixtures configuration...")
+        # Update status - Saving the fixtures selection
+        update_export_status(doctype_name, "In Progress", "Saving fixtures configuration...")
         
-        # Update hooks.py with fixtures
-        update_hooks_file(app_info, export_doc)
+        # Store the fixtures selection on the document; hooks.py is never rewritten
+        with profile.stage("fixture_selection"):
+            save_fixture_selection(doctype_name, get_fixture_selection(export_doc))
         
         # Update status - Running export
         update_export_status(doctype_name, "In Progress", "Running export fixtures process...")
         
+        units = get_export_units(export_doc)
+        if len(units) > 1:
+            # Fan out into one job per DocType / script type; the last part to
+            # finish enqueues finalize_export, so no single job carries the whole export
+            enqueue_export_parts(doctype_name, export_doc, app_info, units)
+            return
+        
         # Run custom export fixtures with proper data access
-        exported_files = export_fixtures_handler(app_info, export_doc)
+        manifest = ExportManifest()
+        with profile.stage("export_fixtures"):
+            export_fixtures_handler(app_info, export_doc, manifest, profile, get_export_resume_path(doctype_name))
         
-        # Check for any remaining empty JSON files and try to fix them
-        fix_empty_json_files(app_info, export_doc)
+        complete_export(doctype_name, export_doc, app_info, manifest, profile)
         
-        # Get final list of all valid exported files
-        fixtures_path = os.path.join(app_info["path"], app_info["name"], "fixtures")
-        all_exported_files = []
-        for root, dirs, files in os.walk(fixtures_path):
-            for file in files:
-                if file.endswith('.json'):
-                    file_path = os.path.join(root, file)
-                    # Only include valid non-empty files
-                    try:
-                        if os.path.getsize(file_path) > 5:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                                if content.strip() and content.strip() not in ['{}', '[]']:
-                                    # Try to parse it to confirm it's valid JSON
-                                    json.loads(content)
-                                    all_exported_files.append(file_path)
-                    except:
-                        # If there's any issue, skip this file
-                        pass
+    except Exception as e:
+        fail_export(doctype_name, e, profile)
+        release_export_job(doctype_name, export_doc)
+    finally:
+        flush_export_log()
+
+def complete_export(doctype_name, export_doc, app_info, manifest, profile=None, failed_units=None):
+    """
+    Collect the exported fixtures, attach and email them and mark the export as done
+    
+    The files are taken from the job's manifest, so none of them is read back from disk.
+    With failed_units (descriptions of the fanned-out parts that failed) the
+    export is marked "Partial" instead of "Completed".
+    """
+    profile = profile or ExportProfile()
+    failed_message = f" Failed: {', '.join(failed_units)}." if failed_units else ""
+    final_status = "Partial" if failed_units else "Completed"
+    try:
+        # Get final list of all exported files that hold records
+        with profile.stage("collect_files"):
+            all_exported_files = manifest.get_files()
+            for file_path in all_exported_files:
+                profile.record(rows=1, bytes=manifest.get(file_path)["size"])
         
         if not all_exported_files:
-            update_export_status(doctype_name, "Completed with warnings", "No valid fixtures were exported")
+            if failed_units:
+                update_export_status(doctype_name, "Failed", f"No fixtures were exported.{failed_message}")
+            else:
+                update_export_status(doctype_name, "Completed with warnings", "No valid fixtures were exported")
             frappe.db.commit()
             return
         
@@ -116,25 +189,42 @@ def execute_export_customizations(doctype_name, export_doc):
         update_export_status(doctype_name, "In Progress", f"Saving {len(all_exported_files)} exported files...")
         
         # Save exported files in File DocType
-        file_links = save_exported_files(all_exported_files, doctype_name)
+        with profile.stage("save_files"):
+            file_links = save_exported_files(
+                all_exported_files,
+                doctype_name,
+                cint(export_doc.get('attach_individual_files'))
+            )
         
         # Send emails if specified
         if export_doc.get('emails') and file_links:
             update_export_status(doctype_name, "In Progress", "Sending email notifications...")
-            send_exported_files_email(export_doc['emails'], file_links, doctype_name)
+            with profile.stage("email"):
+                send_exported_files_email(
+                    export_doc['emails'],
+                    file_links,
+                    doctype_name,
+                    export_doc.get('email_attachment_limit')
+                )
+                profile.record(rows=len(export_doc['emails']))
         
         # Update final status
-        update_export_status(
-            doctype_name, 
-            "Completed", 
-            f"Export completed successfully. {len(file_links)} files exported."
-        )
+        if failed_units:
+            final_message = f"Export partially completed. {len(file_links)} files exported.{failed_message}"
+        else:
+            final_message = f"Export completed successfully. {len(file_links)} files exported."
+        update_export_status(doctype_name, final_status, final_message)
         frappe.db.commit()
         
         # Add the results to the doctype directly for retrieval
         doc = frappe.get_doc("Export Customizations Module", doctype_name)
-        doc.db_set('last_export_result', json.dumps({"files": file_links}))
-        doc.add_comment('Comment', text=f"Export completed successfully. {len(file_links)} files exported.")
+        doc.db_set('last_export_result', json.dumps({
+            "files": file_links,
+            "failed_parts": failed_units or [],
+            "manifest": manifest.get_entries(),
+            "profile": profile.as_dict()
+        }, default=str))
+        doc.add_comment('Comment', text=final_message)
         
         # Use multiple approaches to ensure the document is saved
         try:
@@ -172,7 +262,7 @@ def execute_export_customizations(doctype_name, export_doc):
                 
             # Method 3: Try db_set with update_modified flag
             try:
-                doc.db_set('export_status', 'Completed', update_modified=True)
+                doc.db_set('export_status', final_status, update_modified=True)
                 frappe.db.commit()
             except Exception as db_set_error:
                 safe_log(f"Method 3 save failed: {str(db_set_error)}")
@@ -183,18 +273,72 @@ def execute_export_customizations(doctype_name, export_doc):
             frappe.db.commit()
         
     except Exception as e:
-        error_msg = f"Error in export process: {str(e)[:200]}"  # Limit error message length
-        safe_log(title="Export Error", message=frappe.get_traceback())
-        update_export_status(doctype_name, "Failed", error_msg)
-        
-        # Add error comment
-        try:
-            doc = frappe.get_doc("Export Customizations Module", doctype_name)
-            doc.add_comment('Comment', text=f"Export failed: {error_msg}")
-        except:
-            pass
-        
-        frappe.db.commit()
+        fail_export(doctype_name, e, profile)
+    finally:
+        release_export_job(doctype_name, export_doc)
+
+def get_export_job_key(doctype_name, export_doc):
+    """
+    Cache key of the export of a document with the selection in export_doc.
+    
+    The recipients and delivery options are part of the key, so a request
+    mailing someone else is queued instead of attached to a running export.
+    """
+    selection = json.dumps({
+        "fixtures": get_fixture_selection(export_doc),
+        "emails": sorted(email.get('email') for email in export_doc.get('emails') or [] if email.get('email')),
+        "email_attachment_limit": export_doc.get('email_attachment_limit'),
+        "attach_individual_files": cint(export_doc.get('attach_individual_files'))
+    }, sort_keys=True, default=str)
+    fingerprint = hashlib.sha256(selection.encode()).hexdigest()
+    return frappe.cache().make_key(f"customization_export_job:{doctype_name}:{fingerprint}")
+
+
+def claim_export_job(doctype_name, export_doc):
+    """
+    Claim the export of a document and selection, returning False if an identical one is in progress.
+    
+    The claim covers the whole export, including fanned-out parts, until
+    release_export_job is called when it completes or fails. It expires on
+    its own in case the worker dies; a fanned-out export extends it with
+    extend_export_job as it goes.
+    """
+    return bool(frappe.cache().set(
+        get_export_job_key(doctype_name, export_doc),
+        now(),
+        ex=EXPORT_PART_TIMEOUT * 2,
+        nx=True
+    ))
+
+
+def extend_export_job(doctype_name, export_doc, seconds):
+    """Keep the claim of a running export for at least another seconds, unless it was released"""
+    key = get_export_job_key(doctype_name, export_doc)
+    if frappe.cache().ttl(key) < seconds:
+        frappe.cache().expire(key, seconds)
+
+
+def release_export_job(doctype_name, export_doc):
+    """Let the next export of the same document and selection be queued"""
+    frappe.cache().delete(get_export_job_key(doctype_name, export_doc))
+
+
+def fail_export(doctype_name, error, profile=None):
+    """Record a failed export on the document, with the timings of the stages that ran"""
+    error_msg = f"Error in export process: {str(error)[:200]}"  # Limit error message length
+    safe_log(title="Export Error", message=frappe.get_traceback())
+    update_export_status(doctype_name, "Failed", error_msg)
+    
+    # Add error comment
+    try:
+        doc = frappe.get_doc("Export Customizations Module", doctype_name)
+        if profile:
+            doc.db_set('last_export_result', json.dumps({"error": error_msg, "profile": profile.as_dict()}, default=str))
+        doc.add_comment('Comment', text=f"Export failed: {error_msg}")
+    except:
+        pass
+    
+    frappe.db.commit()
 
 def update_export_status(doctype_name, status, message):
     """Update the export status in the document"""
@@ -281,265 +425,70 @@ def get_bench_path():
     
     frappe.throw("Could not determine bench path. Please run this from within a Frappe bench.")
 
-def update_hooks_file(app_info, export_doc):
-    """Update the hooks.py file with fixtures based on user selection"""
-    hooks_path = os.path.join(app_info["path"], app_info["name"], "hooks.py")
+def export_stored_fixtures(docname=None, timeout=None):
+    """
+    Export the stored fixtures selection in-process, within the time and memory budget.
     
-    if not os.path.exists(hooks_path):
-        frappe.throw(f"hooks.py file not found at {hooks_path}")
+    Exports the selection stored by the last export of docname, or the
+    fixtures of this app together with every stored selection.
+    ExportBudgetExceeded is raised once the budget is used up.
     
-    # Create a backup of hooks.py
-    backup_path = f"{hooks_path}.bak.{now().replace(':', '-').replace(' ', '_')}"
-    try:
-        with open(hooks_path, 'r') as src_file, open(backup_path, 'w') as backup_file:
-            backup_file.write(src_file.read())
-    except Exception as e:
-        frappe.throw(f"Error creating backup of hooks.py: {str(e)}")
+    Returns:
+        ExportManifest: The fixture files written
+    """
+    fixtures_path = frappe.get_app_path(APP_NAME, "fixtures")
+    os.makedirs(fixtures_path, exist_ok=True)
     
-    # Read current hooks.py content
-    try:
-        with open(hooks_path, 'r') as file:
-            hooks_content = file.read()
-    except Exception as e:
-        frappe.throw(f"Error reading hooks.py: {str(e)}")
-    
-    # Prepare fixtures list
-    fixtures = []
-    
-    # Add DocTypes from export_doctypes
-    if export_doc.get('export_doctypes'):
-        doctype_names = [d['doctype_name'] for d in export_doc['export_doctypes'] if d.get('doctype_name')]
-        fixtures.extend(doctype_names)
-        
-        # Add Custom Fields for these doctypes
-        for dt in doctype_names:
-            fixtures.append({
-                "dt": "Custom Field",
-                "filters": [["dt", "=", dt]]
-            })
-            
-            # Add Property Setter for these doctypes
-            fixtures.append({
-                "dt": "Property Setter",
-                "filters": [["doc_type", "=", dt]]
-            })
+    fixtures = get_stored_selection(docname) if docname else get_fixtures()
+    safe_log(f"Exporting {len(fixtures)} stored fixtures in-process")
     
-    # Add Client Scripts
-    if export_doc.get('all_client_scripts'):
-        fixtures.append("Client Script")
-    elif export_doc.get('export_client_scripts'):
-        client_script_names = [c['client_script_name'] for c in export_doc['export_client_scripts'] if c.get('client_script_name')]
-        if client_script_names:
-            fixtures.append({
-                "dt": "Client Script",
-                "filters": [["name", "in", client_script_names]]
-            })
-    
-    # Add Server Scripts
-    if export_doc.get('all_server_scripts'):
-        fixtures.append("Server Script")
-    elif export_doc.get('export_server_scripts'):
-        server_script_names = [s['server_script_name'] for s in export_doc['export_server_scripts'] if s.get('server_script_name')]
-        if server_script_names:
-            fixtures.append({
-                "dt": "Server Script",
-                "filters": [["name", "in", server_script_names]]
-            })
-    
-    # Convert fixtures to Python format for hooks.py using a more reliable method
-    fixtures_code = format_fixtures_for_hooks(fixtures)
-    
-    # Update hooks.py file
-    try:
-        # Check if hooks.py has existing fixtures
-        if 'fixtures' in hooks_content:
-            # Replace existing fixtures - using a more reliable approach
-            pattern = re.compile(r'fixtures\s*=.*?(?=\n\w+|\Z)', re.DOTALL)
-            if pattern.search(hooks_content):
-                new_hooks_content = pattern.sub(f'fixtures = {fixtures_code}', hooks_content)
-            else:
-                # If pattern not found but 'fixtures' string exists, try another approach
-                lines = hooks_content.split('\n')
-                in_fixtures = False
-                new_lines = []
-                for line in lines:
-                    if 'fixtures' in line and '=' in line and not in_fixtures:
-                        new_lines.append(f'fixtures = {fixtures_code}')
-                        in_fixtures = True
-                    elif in_fixtures and (line.strip().startswith(']') or line.strip() == ']'):
-                        in_fixtures = False
-                    elif not in_fixtures:
-                        new_lines.append(line)
-                new_hooks_content = '\n'.join(new_lines)
-        else:
-            # Add fixtures to the end of the file
-            if hooks_content.strip() and not hooks_content.endswith('\n'):
-                hooks_content += '\n'
-            new_hooks_content = hooks_content + f'\nfixtures = {fixtures_code}\n'
-        
-        # Ensure there are no indentation errors
-        try:
-            # Try to compile the new content to check for syntax errors
-            compile(new_hooks_content, hooks_path, 'exec')
-        except IndentationError:
-            safe_log("Indentation error detected in generated hooks.py. Using simplified format.")
-            # Fall back to a simpler format if there's an indentation issue
-            new_hooks_content = hooks_content.split('fixtures =')[0].rstrip() + f'\n\nfixtures = {fixtures_code}\n'
-        
-        # Write updated hooks.py
-        with open(hooks_path, 'w') as file:
-            file.write(new_hooks_content)
-        
-        return True
-    except Exception as e:
-        # Restore from backup if update fails
-        try:
-            if os.path.exists(backup_path):
-                with open(backup_path, 'r') as backup_file, open(hooks_path, 'w') as hooks_file:
-                    hooks_file.write(backup_file.read())
-        except:
-            pass  # Ignore errors in restoring backup
-        
-        frappe.throw(f"Error updating hooks.py: {str(e)}")
-
-def format_fixtures_for_hooks(fixtures):
-    """Format fixtures list as Python code with proper indentation"""
-    if not fixtures:
-        return "[]"
-    
-    lines = ["["]
-    for fixture in fixtures:
-        if isinstance(fixture, str):
-            lines.append(f'    "{fixture}",')
-        elif isinstance(fixture, dict):
-            lines.append("    {")
-            for key, value in fixture.items():
-                if isinstance(value, list):
-                    lines.append(f'        "{key}": [')
-                    for item in value:
-                        if isinstance(item, list):
-                            item_str = '['
-                            for elem in item:
-                                if isinstance(elem, str):
-                                    item_str += f'"{elem}", '
-                                else:
-                                    item_str += f"{elem}, "
-                            item_str = item_str.rstrip(", ") + "]"
-                            lines.append(f"            {item_str},")
-                        else:
-                            lines.append(f'            "{item}",')
-                    lines.append('        ],')
-                else:
-                    lines.append(f'        "{key}": "{value}",')
-            lines.append("    },")
-    lines.append("]")
-    
-    return "\n".join(lines)
+    manifest = ExportManifest()
+    write_fixture_files(fixtures, fixtures_path, manifest, ExportBudget.from_site_config(timeout))
+    return manifest
 
-def run_export_fixtures_with_timeout(app_info, timeout=300):
-    """Run custom export fixtures logic and return exported file paths"""
-    site_name = frappe.local.site
-    bench_path = get_bench_path()
-    fixtures_path = os.path.join(app_info["path"], app_info["name"], "fixtures")
-    
-    # Create fixtures directory if it doesn't exist
-    os.makedirs(fixtures_path, exist_ok=True)
+
+def write_fixture_files(fixtures, fixtures_path, manifest, budget=None):
+    """
+    Export fixtures entries in-process, one file per DocType like bench export-fixtures.
     
-    try:
-        # First approach: Get export_doc from the current execution context
-        export_doc = None
-        if hasattr(frappe.local, 'form_dict') and frappe.local.form_dict.get('kwargs'):
-            try:
-                kwargs = json.loads(frappe.local.form_dict.get('kwargs'))
-                if kwargs.get('export_doc'):
-                    export_doc = kwargs.get('export_doc')
-            except:
-                pass
-        
-        # If we have the export_doc, use our custom handler
-        if export_doc:
-            safe_log("Using custom export handler")
-            return export_fixtures_handler(app_info, export_doc)
-        
-        # Otherwise, fall back to the bench command (not recommended)
-        safe_log("Falling back to bench export-fixtures command")
-        cmd = f"cd {bench_path} && bench --site {site_name} export-fixtures"
-        
-        # Use a safe logging approach
-        safe_log("Running command: " + cmd)
-        
-        # Run process with timeout
-        process = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, preexec_fn=os.setsid)
-        
+    The budget is checked before every page of records. When the export of
+    a file fails (e.g. with ExportBudgetExceeded), the file is removed and
+    the exception is raised.
+    """
+    for fixture in merge_fixtures(fixtures):
+        filters = None
+        or_filters = None
+        if isinstance(fixture, dict):
+            filters = fixture.get("filters")
+            or_filters = fixture.get("or_filters")
+            fixture = fixture.get("doctype") or fixture.get("dt")
+        
+        file_path = os.path.join(fixtures_path, frappe.scrub(fixture) + ".json")
         try:
-            stdout, stderr = process.communicate(timeout=timeout)
-            # Use safe logging for potentially long output
-            if stdout:
-                safe_log("Export fixtures stdout: " + stdout.decode('utf-8')[:500] + "..." if len(stdout) > 500 else stdout.decode('utf-8'))
-        except subprocess.TimeoutExpired:
-            # Kill the process group if it times out
-            os.killpg(os.getpgid(process.pid), signal.SIGTERM)
-            safe_log(f"Process timed out after {timeout} seconds")
-        
-        # Find all exported JSON files
-        exported_files = []
-        for root, dirs, files in os.walk(fixtures_path):
-            for file in files:
-                if file.endswith('.json'):
-                    file_path = os.path.join(root, file)
-                    if os.path.getsize(file_path) > 2:  # More than just "{}"
-                        exported_files.append(file_path)
-        
-        return exported_files
-    
-    except Exception as e:
-        safe_log(f"Exception while running export fixtures: {str(e)}\n{frappe.get_traceback()}")
-        frappe.throw(f"Error running export fixtures: {str(e)[:100]}")  # Limit error message length
+            with JSONArrayWriter(file_path, ensure_ascii=False) as writer:
+                for doc_data in iter_export_records(fixture, filters, budget=budget, or_filters=or_filters):
+                    writer.write(doc_data)
+        except Exception:
+            # Do not leave a partial fixture behind
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
+        
+        manifest.add_writer(writer)
 
 
 def is_custom_doctype(doctype_name):
     """
     Determine if a DocType is a custom (user-created) DocType or a core DocType.
     
+    Answered from the per-site classification cache, which is built with one
+    query and cleared whenever a DocType or Module Def changes.
+    
     Returns:
         bool: True if it's a custom DocType, False if it's a core DocType
     """
     try:
-        # Get DocType metadata
-        doctype_meta = frappe.get_doc("DocType", doctype_name)
-        
-        # Check if the DocType has the 'custom' flag set to 1
-        if doctype_meta.custom == 1:
-            return True
-            
-        # Check if the module is not a core module
-        core_modules = [
-            # Frappe core modules
-            'Core', 'Website', 'Workflow', 'Email', 'Custom', 'Geo', 'Desk', 
-            'Integrations', 'Printing', 'Contacts', 'Social', 'Automation',
-            
-            # ERPNext core modules
-            'Accounts', 'CRM', 'Buying', 'Projects', 'Selling', 'Setup',
-            'Manufacturing', 'Stock', 'Support', 'Utilities', 'Assets', 
-            'Portal', 'Maintenance', 'Regional', 'ERPNext Integrations',
-            'Quality Management', 'Communication', 'Telephony', 'Bulk Transaction',
-            'Subcontracting', 'EDI',
-            
-            # HRMS core modules
-            'HR', 'Payroll'
-        ]
-        
-        # Not in core modules - it's a custom module
-        if doctype_meta.module not in core_modules:
-            return True
-            
-        # Check app name from module definition
-        module_def = frappe.get_doc("Module Def", doctype_meta.module)
-        if module_def.app_name not in ['frappe', 'erpnext', 'hrms']:
-            return True
-            
-        # This is a core DocType
-        return False
+        return doctype_classifier.is_custom_doctype(doctype_name)
         
     except Exception as e:
         safe_log(f"Error checking if DocType {doctype_name} is custom: {str(e)}")
@@ -547,8 +496,41 @@ def is_custom_doctype(doctype_name):
         return False
 
 
-def export_fixtures_handler(app_info, export_doc):
-    """Central handler for exporting fixtures in the same format as bench export-fixtures"""
+def export_custom_doctype_files(doctype, fixtures_path, manifest=None, resume_dir=None):
+    """
+    Export the definition and data of a custom DocType.
+    
+    Only writes files named after the DocType, so it is safe to run for
+    several DocTypes concurrently. See write_export_records for resume_dir.
+    
+    Returns:
+        list: Paths of the files written (empty for core DocTypes)
+    """
+    file_paths = []
+    
+    # For custom DocTypes, export the full DocType definition
+    if is_custom_doctype(doctype):
+        safe_log(f"DocType {doctype} is a custom DocType - exporting definition")
+        file_path = export_doctype_definition(doctype, fixtures_path, manifest)
+        if file_path:
+            file_paths.append(file_path)
+        
+        # Also export the data records for reference - exactly like bench export-fixtures
+        data_file_path = export_doctype(doctype, fixtures_path, manifest, resume_dir)
+        if data_file_path and data_file_path not in file_paths:
+            file_paths.append(data_file_path)
+    
+    return file_paths
+
+
+def export_fixtures_handler(app_info, export_doc, manifest, profile=None, resume_dir=None):
+    """
+    Central handler for exporting fixtures in the same format as bench export-fixtures
+    
+    Every file written is recorded in manifest. Queries run by export workers
+    are added to the running stage of profile. DocType data is written in
+    resume_dir until complete (see write_export_records).
+    """
     fixtures_path = os.path.join(app_info["path"], app_info["name"], "fixtures")
     
     # Get hooks.py fixtures
@@ -565,75 +547,417 @@ def export_fixtures_handler(app_info, export_doc):
     exported_files = []
     
     # 1. Export DocTypes from export_doc
-    for dt_entry in export_doc.get('export_doctypes', []):
-        if dt_entry.get('doctype_name'):
-            doctype = dt_entry.get('doctype_name')
-            
-            # Check if this is a custom DocType
-            is_custom = is_custom_doctype(doctype)
-            
-            # For custom DocTypes, export the full DocType definition
-            if is_custom:
-                safe_log(f"DocType {doctype} is a custom DocType - exporting definition")
-                file_path = export_doctype_definition(doctype, fixtures_path)
-                if file_path:
-                    exported_files.append(file_path)
-                
-                # Also export the data records for reference - exactly like bench export-fixtures
-                data_file_path = export_doctype(doctype, fixtures_path)
-                if data_file_path and data_file_path not in exported_files:
-                    exported_files.append(data_file_path)
-            
-            # Export Custom Fields for all DocTypes
-            cf_path = export_custom_fields(doctype, fixtures_path)
-            if cf_path and cf_path not in exported_files:
-                exported_files.append(cf_path)
-            
-            # Export Property Setters for all DocTypes
-            ps_path = export_property_setters(doctype, fixtures_path)
-            if ps_path and ps_path not in exported_files:
-                exported_files.append(ps_path)
+    doctype_names = [dt_entry.get('doctype_name') for dt_entry in export_doc.get('export_doctypes', []) if dt_entry.get('doctype_name')]
     
-    # 2. Export Client Scripts
-    if export_doc.get('all_client_scripts'):
-        file_path = export_client_scripts(None, fixtures_path)
-        if file_path and file_path not in exported_files:
-            exported_files.append(file_path)
-    elif export_doc.get('export_client_scripts'):
-        client_script_names = [c['client_script_name'] for c in export_doc['export_client_scripts'] if c.get('client_script_name')]
-        if client_script_names:
-            filters = [["name", "in", client_script_names]]
-            file_path = export_client_scripts(filters, fixtures_path)
-            if file_path and file_path not in exported_files:
+    # Custom DocType definitions and data go to per-DocType files, so they can
+    # be exported on parallel workers; results are merged in selection order
+    custom_doctype_files = map_with_site_connections(
+        lambda doctype: export_custom_doctype_files(doctype, fixtures_path, manifest, resume_dir),
+        doctype_names,
+        cint(export_doc.get('export_workers')) or 1,
+        profile
+    )
+    
+    # Custom Fields and Property Setters share one file each; collect them
+    # for all DocTypes and write each file once
+    custom_field_accumulator = FixtureAccumulator(os.path.join(fixtures_path, "custom_field.json"))
+    property_setter_accumulator = FixtureAccumulator(os.path.join(fixtures_path, "property_setter.json"))
+    
+    for doctype, doctype_files in zip(doctype_names, custom_doctype_files):
+        for file_path in doctype_files:
+            if file_path not in exported_files:
                 exported_files.append(file_path)
+        
+        # Export Custom Fields for all DocTypes
+        export_custom_fields(doctype, fixtures_path, custom_field_accumulator)
+        
+        # Export Property Setters for all DocTypes
+        export_property_setters(doctype, fixtures_path, property_setter_accumulator)
     
-    # 3. Export Server Scripts
-    if export_doc.get('all_server_scripts'):
-        file_path = export_server_scripts(None, fixtures_path)
+    for file_accumulator in (custom_field_accumulator, property_setter_accumulator):
+        file_path = file_accumulator.flush(manifest)
         if file_path and file_path not in exported_files:
             exported_files.append(file_path)
-    elif export_doc.get('export_server_scripts'):
-        server_script_names = [s['server_script_name'] for s in export_doc['export_server_scripts'] if s.get('server_script_name')]
-        if server_script_names:
-            filters = [["name", "in", server_script_names]]
-            file_path = export_server_scripts(filters, fixtures_path)
-            if file_path and file_path not in exported_files:
-                exported_files.append(file_path)
     
-    # 4. Find any additional JSON files
-    for root, dirs, files in os.walk(fixtures_path):
-        for file in files:
-            if file.endswith('.json'):
-                file_path = os.path.join(root, file)
-                if file_path not in exported_files and os.path.getsize(file_path) > 2:
-                    exported_files.append(file_path)
+    # 2. Export Client Scripts
+    file_path = export_selected_client_scripts(export_doc, fixtures_path, manifest)
+    if file_path and file_path not in exported_files:
+        exported_files.append(file_path)
+    
+    # 3. Export Server Scripts
+    file_path = export_selected_server_scripts(export_doc, fixtures_path, manifest)
+    if file_path and file_path not in exported_files:
+        exported_files.append(file_path)
     
     return exported_files
 
 
+def export_selected_client_scripts(export_doc, fixtures_path, manifest=None):
+    """Export the Client Scripts selected in export_doc"""
+    if export_doc.get('all_client_scripts'):
+        return export_client_scripts(None, fixtures_path, manifest)
+    
+    client_script_names = [c['client_script_name'] for c in export_doc.get('export_client_scripts') or [] if c.get('client_script_name')]
+    if client_script_names:
+        return export_client_scripts([["name", "in", client_script_names]], fixtures_path, manifest)
+    
+    return None
+
+
+def export_selected_server_scripts(export_doc, fixtures_path, manifest=None):
+    """Export the Server Scripts selected in export_doc"""
+    if export_doc.get('all_server_scripts'):
+        return export_server_scripts(None, fixtures_path, manifest)
+    
+    server_script_names = [s['server_script_name'] for s in export_doc.get('export_server_scripts') or [] if s.get('server_script_name')]
+    if server_script_names:
+        return export_server_scripts([["name", "in", server_script_names]], fixtures_path, manifest)
+    
+    return None
+
+
+def get_export_units(export_doc):
+    """
+    Split an export into independent units of work.
+    
+    Returns:
+        list: (unit_type, unit_name) tuples - one per DocType, plus one per script type
+    """
+    units = [("DocType", d['doctype_name']) for d in export_doc.get('export_doctypes', []) if d.get('doctype_name')]
+    
+    if export_doc.get('all_client_scripts') or any(c.get('client_script_name') for c in export_doc.get('export_client_scripts') or []):
+        units.append(("Client Script", None))
+    
+    if export_doc.get('all_server_scripts') or any(s.get('server_script_name') for s in export_doc.get('export_server_scripts') or []):
+        units.append(("Server Script", None))
+    
+    return units
+
+
+def get_export_parts_path(group_id, index=None):
+    """Directory holding the partial output of a fanned-out export (outside fixtures/)"""
+    path = frappe.get_site_path("private", "customization_export_parts", group_id)
+    if index is not None:
+        path = os.path.join(path, f"{index:05d}")
+    return path
+
+
+def get_export_resume_path(doctype_name=None):
+    """
+    Directory holding the resumable data exports of an Export Customizations Module.
+    
+    Unlike the parts directory it does not depend on the run, so a retried
+    export of the same document finds the checkpoints of the previous one.
+    Without doctype_name, the directory shared by exports of no document.
+    """
+    path = frappe.get_site_path("private", "customization_export_checkpoints")
+    if doctype_name:
+        path = os.path.join(path, frappe.scrub(doctype_name))
+    return path
+
+
+def get_export_part_job_id(group_id, index):
+    """RQ job id of a part, so the deadline check can tell whether it is still queued or running"""
+    return f"customization_export_part:{group_id}:{index}"
+
+
+def enqueue_export_parts(doctype_name, export_doc, app_info, units):
+    """
+    Queue one export job per unit on the long queue.
+    
+    The group is registered with a deadline, so check_export_part_deadlines
+    can finalize it even when a part is killed before it reports back.
+    """
+    group_id = frappe.generate_hash(length=12)
+    
+    frappe.cache().hset(EXPORT_GROUPS_KEY, group_id, {
+        "doctype_name": doctype_name,
+        "export_doc": export_doc,
+        "app_info": app_info,
+        "total": len(units),
+        "deadline": time.time() + EXPORT_PART_TIMEOUT
+    })
+    # The group may run until its deadline, one more EXPORT_PART_TIMEOUT for
+    # parts still running (see check_export_part_deadlines) and finalize_export,
+    # plus the wait in the queue
+    extend_export_job(doctype_name, export_doc, EXPORT_PART_TIMEOUT * 4)
+    
+    for index, (unit_type, unit_name) in enumerate(units):
+        enqueue(
+            export_fixtures_part,
+            queue='long',
+            timeout=EXPORT_PART_TIMEOUT,
+            event='export_customizations',
+            job_name=f"export_customizations_{doctype_name}_{group_id}_{index}",
+            job_id=get_export_part_job_id(group_id, index),
+            doctype_name=doctype_name,
+            export_doc=export_doc,
+            app_info=app_info,
+            group_id=group_id,
+            index=index,
+            total=len(units),
+            unit_type=unit_type,
+            unit_name=unit_name
+        )
+    
+    update_export_status(doctype_name, "In Progress", f"Running export fixtures process in {len(units)} parts...")
+
+
+def export_fixtures_part(doctype_name, export_doc, app_info, group_id, index, total, unit_type, unit_name):
+    """
+    Export a single unit into its own parts directory.
+    
+    Every part reports itself as done even when it fails (a failure is also
+    recorded in the group's failed set), so the part that completes the group
+    enqueues finalize_export. Parts killed before reporting are handled by
+    check_export_part_deadlines.
+    """
+    start_export_log()
+    part_path = get_export_parts_path(group_id, index)
+    os.makedirs(part_path, exist_ok=True)
+    manifest = ExportManifest()
+    failed = False
+    
+    try:
+        if unit_type == "DocType":
+            export_custom_doctype_files(unit_name, part_path, manifest, get_export_resume_path(doctype_name))
+            export_custom_fields(unit_name, part_path, manifest=manifest)
+            export_property_setters(unit_name, part_path, manifest=manifest)
+        elif unit_type == "Client Script":
+            export_selected_client_scripts(export_doc, part_path, manifest)
+        elif unit_type == "Server Script":
+            export_selected_server_scripts(export_doc, part_path, manifest)
+    except Exception as e:
+        failed = True
+        safe_log(f"Error exporting part {index} ({unit_type} {unit_name or ''}): {str(e)}\n{frappe.get_traceback()}")
+    finally:
+        if not failed:
+            manifest.save(os.path.join(part_path, MANIFEST_FILE_NAME))
+        frappe.db.commit()
+        
+        done = report_export_part(group_id, index, failed)
+        extend_export_job(doctype_name, export_doc, EXPORT_PART_TIMEOUT * 3)
+        
+        update_export_status(doctype_name, "In Progress", f"Running export fixtures process... {done} of {total} parts done")
+        
+        if done >= total:
+            enqueue_finalize_export(doctype_name, export_doc, app_info, group_id, total)
+        
+        flush_export_log()
+
+
+def report_export_part(group_id, index, failed=False):
+    """Record a finished part of the group and return the number of parts done"""
+    cache = frappe.cache()
+    
+    done_key = f"customization_export_parts_done:{group_id}"
+    cache.sadd(done_key, index)
+    cache.expire(cache.make_key(done_key), EXPORT_PART_TIMEOUT * 3)
+    
+    if failed:
+        failed_key = f"customization_export_parts_failed:{group_id}"
+        cache.sadd(failed_key, index)
+        cache.expire(cache.make_key(failed_key), EXPORT_PART_TIMEOUT * 3)
+    
+    return len(cache.smembers(done_key))
+
+
+def get_reported_export_parts(group_id, key):
+    """Indexes of the parts in the group's done or failed set"""
+    return {int(index) for index in frappe.cache().smembers(f"customization_export_parts_{key}:{group_id}")}
+
+
+def enqueue_finalize_export(doctype_name, export_doc, app_info, group_id, total):
+    """Queue the fan-in job, once per group even if the last part and the deadline check race"""
+    claim_key = frappe.cache().make_key(f"customization_export_finalize:{group_id}")
+    if not frappe.cache().set(claim_key, 1, ex=EXPORT_PART_TIMEOUT * 3, nx=True):
+        return
+    
+    extend_export_job(doctype_name, export_doc, EXPORT_PART_TIMEOUT * 2)
+    enqueue(
+        finalize_export,
+        queue='long',
+        timeout=EXPORT_PART_TIMEOUT,
+        event='export_customizations',
+        job_name=f"export_customizations_{doctype_name}_{group_id}_finalize",
+        doctype_name=doctype_name,
+        export_doc=export_doc,
+        app_info=app_info,
+        group_id=group_id,
+        total=total
+    )
+
+
+def check_export_part_deadlines():
+    """
+    Scheduled: finalize fanned-out exports whose parts did not all report back.
+    
+    After the group deadline, parts that are neither reported nor still
+    queued or running (e.g. killed by an RQ timeout or a dead worker) are
+    marked as failed and the group is finalized. A part still running is
+    waited for up to one more EXPORT_PART_TIMEOUT.
+    """
+    groups = frappe.cache().hgetall(EXPORT_GROUPS_KEY) or {}
+    if not groups:
+        return
+    
+    start_export_log()
+    try:
+        now = time.time()
+        for group_id, group in groups.items():
+            group_id = frappe.safe_decode(group_id)
+            if now < group["deadline"]:
+                continue
+            
+            done = get_reported_export_parts(group_id, "done")
+            pending = [index for index in range(group["total"]) if index not in done]
+            
+            still_running = any(is_job_enqueued(get_export_part_job_id(group_id, index)) for index in pending)
+            if still_running and now < group["deadline"] + EXPORT_PART_TIMEOUT:
+                continue
+            
+            for index in pending:
+                safe_log(f"Export part {index} of group {group_id} did not finish before its deadline")
+                report_export_part(group_id, index, failed=True)
+            
+            enqueue_finalize_export(group["doctype_name"], group["export_doc"], group["app_info"], group_id, group["total"])
+    finally:
+        flush_export_log()
+
+
+def finalize_export(doctype_name, export_doc, app_info, group_id, total):
+    """
+    Fan-in job: merge the partial outputs into fixtures/ and complete the export.
+    
+    Parts that failed, never reported or left no output are listed on the
+    export, which is then marked "Partial" (or "Failed" when nothing was exported).
+    """
+    start_export_log()
+    profile = ExportProfile()
+    try:
+        fixtures_path = os.path.join(app_info["path"], app_info["name"], "fixtures")
+        os.makedirs(fixtures_path, exist_ok=True)
+        
+        done = get_reported_export_parts(group_id, "done")
+        failed = get_reported_export_parts(group_id, "failed")
+        failed.update(index for index in range(total) if index not in done)
+        
+        manifest = ExportManifest()
+        with profile.stage("merge_parts"):
+            failed.update(merge_export_parts(group_id, total, fixtures_path, manifest, skip=failed))
+        
+        units = get_export_units(export_doc)
+        failed_units = [
+            " ".join(filter(None, units[index])) if index < len(units) else f"part {index}"
+            for index in sorted(failed)
+        ]
+        
+        complete_export(doctype_name, export_doc, app_info, manifest, profile, failed_units=failed_units)
+    except Exception as e:
+        fail_export(doctype_name, e, profile)
+        release_export_job(doctype_name, export_doc)
+    finally:
+        shutil.rmtree(get_export_parts_path(group_id), ignore_errors=True)
+        frappe.cache().hdel(EXPORT_GROUPS_KEY, group_id)
+        flush_export_log()
+
+
+def merge_export_parts(group_id, total, fixtures_path, manifest, skip=()):
+    """
+    Merge partial outputs in part order, so the result does not depend on which job finished first.
+    
+    Per-DocType files are moved into fixtures_path together with their
+    manifest entry. Shared files are merged with the existing fixture file
+    through a FixtureAccumulator and written once. Parts in skip (e.g. failed
+    ones) are left out; returns the indexes of the other parts that left no output.
+    """
+    accumulators = {}
+    missing = []
+    
+    for index in range(total):
+        if index in skip:
+            continue
+        
+        part_path = get_export_parts_path(group_id, index)
+        manifest_path = os.path.join(part_path, MANIFEST_FILE_NAME)
+        if not os.path.exists(manifest_path):
+            missing.append(index)
+            continue
+        
+        part_manifest = ExportManifest.load(manifest_path)
+        
+        for entry in part_manifest.get_entries():
+            file_path = entry["path"]
+            file_name = os.path.basename(file_path)
+            if file_name not in SHARED_FIXTURE_KEYS:
+                target_path = os.path.join(fixtures_path, file_name)
+                os.replace(file_path, target_path)
+                manifest.add_entry(dict(entry, path=target_path))
+                continue
+            
+            if file_name not in accumulators:
+                accumulators[file_name] = FixtureAccumulator(os.path.join(fixtures_path, file_name))
+            
+            with open(file_path, 'r') as f:
+                accumulators[file_name].add(json.load(f))
+    
+    for file_accumulator in accumulators.values():
+        file_accumulator.flush(manifest)
+    
+    return missing
+
+
+class FixtureAccumulator:
+    """
+    Collects the records of a fixture file shared by several DocTypes and writes it once.
+    
+    Records are merged with the existing file, which is read once, and
+    deduplicated by the key of the file in SHARED_FIXTURE_KEYS; the first
+    record for a key wins. Placeholder entries are dropped when real data exists.
+    """
+    
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.key = SHARED_FIXTURE_KEYS[os.path.basename(file_path)]
+        self.records = {}
+        
+        # Start from the existing fixture file
+        if os.path.exists(file_path) and os.path.getsize(file_path) > 2:
+            try:
+                with open(file_path, 'r') as f:
+                    existing_data = json.load(f)
+                if isinstance(existing_data, list):
+                    self.add(existing_data)
+            except:
+                pass
+    
+    def add(self, records):
+        """Add records whose key has not been seen yet"""
+        for record in records:
+            self.records.setdefault(self.key(record), record)
+    
+    def flush(self, manifest=None):
+        """Write all collected records to the file and record it in the manifest"""
+        all_data = list(self.records.values())
+        if not all_data:
+            return None
+        
+        # Remove placeholder entries if we have real data
+        if len(all_data) > 1:
+            all_data = [item for item in all_data if not item.get("__export_placeholder")]
+        
+        with JSONArrayWriter(self.file_path) as writer:
+            for item in all_data:
+                writer.write(item)
+        
+        if manifest:
+            manifest.add_writer(writer)
+        
+        return self.file_path
+
 
-def export_doctype(doctype, fixtures_path):
-    """Export a DocType to fixtures"""
+def export_doctype(doctype, fixtures_path, manifest=None, resume_dir=None):
+    """Export a DocType to fixtures (see write_export_records for resume_dir)"""
     try:
         file_name = doctype.lower().replace(" ", "_") + ".json"
         file_path = os.path.join(fixtures_path, file_name)
@@ -644,80 +968,227 @@ def export_doctype(doctype, fixtures_path):
             safe_log(f"DocType {doctype} metadata not found")
             return None
         
-        # Get all records of this DocType
-        docs = frappe.get_all(doctype, fields=["name"])
+        # Stream each page of records to disk, resuming an interrupted export
+        writer = write_export_records(doctype, file_path, resume_dir=resume_dir)
         
-        if not docs:
-            # If there are no records, log and return
-            safe_log(f"No records found for DocType {doctype}")
-            return None
+        if writer.count:
+            if manifest:
+                manifest.add(file_path, writer.count, writer.checksum)
+            safe_log(f"Exported {writer.count} {doctype} records to {file_path}")
+            return file_path
         
-        data = []
-        for doc in docs:
+        # If there are no records, log and do not leave an empty array behind
+        safe_log(f"No records found for DocType {doctype}")
+        os.remove(file_path)
+    
+    except Exception as e:
+        safe_log(f"Error exporting DocType {doctype}: {str(e)}")
+    
+    return None
+
+
+def write_export_records(doctype, file_path, filters=None, resume_dir=None):
+    """
+    Write the records of a DocType to file_path, resuming an interrupted export.
+    
+    Every EXPORT_CHECKPOINT_INTERVAL records the file is flushed and a
+    checkpoint (DocType, last name, byte offset, record count) is saved next
+    to it. If the job dies, the next export of the same DocType and filters
+    truncates the partial file to the checkpoint and continues after the
+    last name instead of starting over. The checkpoint is removed once all
+    records are written.
+    
+    The partial file and its checkpoint are kept in resume_dir (by default
+    the shared get_export_resume_path()), named after the DocType and
+    filters, and the file is moved to file_path only once complete. So an
+    interrupted export never leaves a truncated file in fixtures/, and a
+    retry finds its checkpoint even when file_path changes between runs
+    (e.g. a per-run parts directory).
+    
+    Returns:
+        JSONArrayWriter: The closed writer
+    """
+    resume_dir = resume_dir or get_export_resume_path()
+    os.makedirs(resume_dir, exist_ok=True)
+    filters_hash = hashlib.sha256(json.dumps(filters, sort_keys=True, default=str).encode()).hexdigest()[:12]
+    work_path = os.path.join(resume_dir, f"{frappe.scrub(doctype)}-{filters_hash}.json")
+    
+    checkpoint = ExportCheckpoint(work_path, doctype, filters)
+    if checkpoint.load():
+        safe_log(f"Resuming export of {doctype} after {checkpoint.last_name} ({checkpoint.count} records already written)")
+    
+    writer = JSONArrayWriter(work_path, ensure_ascii=False, offset=checkpoint.offset, count=checkpoint.count)
+    try:
+        for doc_data in iter_export_records(doctype, filters, after=checkpoint.last_name):
+            writer.write(doc_data)
+            if writer.count % EXPORT_CHECKPOINT_INTERVAL == 0:
+                writer.flush()
+                checkpoint.save(doc_data["name"], writer.offset, writer.count)
+    finally:
+        writer.close()
+    
+    checkpoint.clear()
+    os.replace(work_path, file_path)
+    return writer
+
+
+def iter_export_records(doctype, filters=None, page_size=EXPORT_PAGE_SIZE, budget=None, after=None, or_filters=None):
+    """
+    Yield export-ready records of a DocType, loaded in pages.
+    
+    Parent rows are read page by page with explicit columns (keyset paginated
+    on name), and every child table is read with one `parent in (...)` query
+    per page, so the number of queries does not grow with the number of records.
+    The records have the same shape as building them from frappe.get_doc.
+    
+    An ExportBudget, if given, is checked before every page. With after,
+    only records named after it are yielded, to continue an earlier export.
+    or_filters apply on top of filters, as in frappe.get_all. A record that
+    cannot be built (or one of whose child rows cannot) is logged and skipped,
+    so one bad row does not fail the whole DocType.
+    """
+    meta = frappe.get_meta(doctype)
+    columns = get_export_columns(meta)
+    table_fields = [(df, frappe.get_meta(df.options)) for df in meta.get_table_fields()]
+    
+    filters = get_filter_list(filters)
+    last_name = after
+    
+    while True:
+        if budget:
+            budget.check(doctype)
+        
+        page_filters = filters + [["name", ">", last_name]] if last_name is not None else filters
+        rows = frappe.get_all(
+            doctype,
+            filters=page_filters,
+            or_filters=or_filters,
+            fields=["name"] + columns,
+            order_by="name asc",
+            limit_page_length=page_size
+        )
+        if not rows:
+            break
+        
+        names = [row.name for row in rows]
+        
+        # Load every child table for the whole page at once
+        children = {}
+        failed = set()
+        for df, child_meta in table_fields:
+            child_rows = frappe.get_all(
+                df.options,
+                filters={"parent": ["in", names], "parenttype": doctype, "parentfield": df.fieldname},
+                fields=["name", "idx", "parent"] + get_export_columns(child_meta),
+                order_by="idx asc"
+            )
+            for child in child_rows:
+                try:
+                    child_data = build_export_record(child_meta, child)
+                except Exception as child_error:
+                    failed.add(child.parent)
+                    safe_log(f"Error exporting {doctype} {child.parent}: {df.options} row {child.name}: {str(child_error)}")
+                    continue
+                children.setdefault((child.parent, df.fieldname), []).append(child_data)
+        
+        for row in rows:
+            if row.name in failed:
+                continue
+            
+            for df, child_meta in table_fields:
+                row[df.fieldname] = children.get((row.name, df.fieldname), [])
+            
             try:
-                # Load the doc more carefully, with explicit field selection
-                full_doc = frappe.get_doc(doctype, doc.name)
-                doc_data = {}
-                
-                # Add each field manually to avoid serialization issues
-                for field in doctype_meta.fields:
-                    field_name = field.fieldname
-                    if hasattr(full_doc, field_name):
-                        field_value = getattr(full_doc, field_name)
-                        
-                        # Special handling for date and datetime fields
-                        if field.fieldtype in ['Date', 'Datetime'] and field_value:
-                            try:
-                                # Convert to string in ISO format for dates
-                                if isinstance(field_value, str):
-                                    # Already a string, leave as is
-                                    doc_data[field_name] = field_value
-                                else:
-                                    # Convert date/datetime to string
-                                    doc_data[field_name] = field_value.isoformat()
-                            except:
-                                # If conversion fails, use string representation
-                                doc_data[field_name] = str(field_value)
-                        else:
-                            # For other field types
-                            doc_data[field_name] = field_value
-                
-                # Ensure doctype is set correctly
-                doc_data['doctype'] = doctype
-                
-                # Include essential fields
-                doc_data['name'] = full_doc.name
-                
-                # Clean up doc_data by removing unnecessary fields
-                for field in ["creation", "modified", "modified_by", "owner", "docstatus", "parentfield", "parenttype"]:
-                    if field in doc_data:
-                        del doc_data[field]
-                
-                data.append(doc_data)
+                doc_data = build_export_record(meta, row)
             except Exception as doc_error:
-                safe_log(f"Error exporting {doctype} {doc.name}: {str(doc_error)}")
+                safe_log(f"Error exporting {doctype} {row.name}: {str(doc_error)}")
+                continue
+            yield doc_data
         
-        if data:
-            # Write data more carefully
+        if len(rows) < page_size:
+            break
+        last_name = names[-1]
+
+
+def get_export_columns(meta):
+    """Database columns of the DocType's own fields, as loaded by frappe.get_doc"""
+    table_columns = set(frappe.db.get_table_columns(meta.name))
+    return [
+        df.fieldname for df in meta.fields
+        if df.fieldname in table_columns and df.fieldtype not in frappe.model.table_fields
+    ]
+
+
+def get_filter_list(filters):
+    """Normalise dict or list filters into a list that more conditions can be appended to"""
+    if not filters:
+        return []
+    
+    if isinstance(filters, dict):
+        return [
+            [fieldname, *value] if isinstance(value, (list, tuple)) else [fieldname, "=", value]
+            for fieldname, value in filters.items()
+        ]
+    
+    return list(filters)
+
+
+def build_export_record(meta, row):
+    """
+    Build the export dict of one row, with the value conversions of frappe.get_doc
+    """
+    doc_data = {}
+    
+    # Add each field manually to avoid serialization issues
+    for field in meta.fields:
+        field_name = field.fieldname
+        if field_name not in row:
+            continue
+        
+        field_value = row[field_name]
+        
+        # Numeric values are normalised the way Document._fix_numeric_types does
+        if field.fieldtype == "Check":
+            field_value = cint(field_value)
+        elif field_value is not None and field.fieldtype == "Int":
+            field_value = cint(field_value)
+        elif field_value is not None and field.fieldtype in ("Float", "Currency", "Percent"):
+            field_value = flt(field_value)
+        
+        # Special handling for date and datetime fields
+        if field.fieldtype in ['Date', 'Datetime'] and field_value:
             try:
-                # Better JSON handling
-                json_str = json.dumps(data, indent=4, default=str, ensure_ascii=False)
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(json_str)
-                
-                safe_log(f"Exported {len(data)} {doctype} records to {file_path}")
-                return file_path
-            except Exception as write_error:
-                safe_log(f"Error writing {doctype} to file: {str(write_error)}")
+                # Convert to string in ISO format for dates
+                if isinstance(field_value, str):
+                    # Already a string, leave as is
+                    doc_data[field_name] = field_value
+                else:
+                    # Convert date/datetime to string
+                    doc_data[field_name] = field_value.isoformat()
+            except:
+                # If conversion fails, use string representation
+                doc_data[field_name] = str(field_value)
+        else:
+            # For other field types
+            doc_data[field_name] = field_value
     
-    except Exception as e:
-        safe_log(f"Error exporting DocType {doctype}: {str(e)}")
+    # Ensure doctype is set correctly
+    doc_data['doctype'] = meta.name
     
-    return None
+    # Include essential fields
+    doc_data['name'] = row['name']
+    if meta.istable:
+        doc_data['idx'] = row['idx']
+    
+    # Clean up doc_data by removing unnecessary fields
+    for field in ["creation", "modified", "modified_by", "owner", "docstatus", "parentfield", "parenttype"]:
+        if field in doc_data:
+            del doc_data[field]
+    
+    return doc_data
 
 
-def export_doctype_definition(doctype, fixtures_path):
+def export_doctype_definition(doctype, fixtures_path, manifest=None):
     """
     Export the DocType structure in the same format as bench export-fixtures
     """
@@ -777,8 +1248,11 @@ def export_doctype_definition(doctype, fixtures_path):
         export_data["doctype"] = "DocType"
         
         # Write to file - bench export puts one DocType per file in an array
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump([export_data], f, indent=4, default=str, ensure_ascii=False)
+        with JSONArrayWriter(file_path, ensure_ascii=False) as writer:
+            writer.write(export_data)
+        
+        if manifest:
+            manifest.add_writer(writer)
         
         safe_log(f"Exported DocType definition for {doctype} to {file_path}")
         return file_path
@@ -787,8 +1261,8 @@ def export_doctype_definition(doctype, fixtures_path):
         safe_log(f"Error exporting DocType definition for {doctype}: {str(e)}\n{frappe.get_traceback()}")
         return None
     
-def export_doctype_with_filters(doctype, filters, fixtures_path):
-    """Export a DocType with filters to fixtures"""
+def export_doctype_with_filters(doctype, filters, fixtures_path, manifest=None, resume_dir=None):
+    """Export a DocType with filters to fixtures (see write_export_records for resume_dir)"""
     try:
         file_name = doctype.lower().replace(" ", "_") + ".json"
         file_path = os.path.join(fixtures_path, file_name)
@@ -800,75 +1274,25 @@ def export_doctype_with_filters(doctype, filters, fixtures_path):
                 if len(f) >= 3:
                     filter_dict[f[0]] = f[2]
         
-        # Get filtered records
-        docs = frappe.get_all(doctype, filters=filter_dict or filters, fields=["name"])
-        
-        if not docs:
-            safe_log(f"No records found for DocType {doctype} with filters {filters}")
-            return None
+        # Stream each page of filtered records to disk, resuming an interrupted export
+        writer = write_export_records(doctype, file_path, filter_dict or filters, resume_dir)
         
-        # Get the metadata for the doctype
-        doctype_meta = frappe.get_meta(doctype)
-        
-        data = []
-        for doc in docs:
-            try:
-                # Load the doc more carefully
-                full_doc = frappe.get_doc(doctype, doc.name)
-                doc_data = {}
-                
-                # Add each field manually to avoid serialization issues
-                for field in doctype_meta.fields:
-                    field_name = field.fieldname
-                    if hasattr(full_doc, field_name):
-                        field_value = getattr(full_doc, field_name)
-                        
-                        # Special handling for date and datetime fields
-                        if field.fieldtype in ['Date', 'Datetime'] and field_value:
-                            try:
-                                if isinstance(field_value, str):
-                                    doc_data[field_name] = field_value
-                                else:
-                                    doc_data[field_name] = field_value.isoformat()
-                            except:
-                                doc_data[field_name] = str(field_value)
-                        else:
-                            doc_data[field_name] = field_value
-                
-                # Ensure doctype is set correctly
-                doc_data['doctype'] = doctype
-                
-                # Include essential fields
-                doc_data['name'] = full_doc.name
-                
-                # Clean up doc_data
-                for field in ["creation", "modified", "modified_by", "owner", "docstatus", "parentfield", "parenttype"]:
-                    if field in doc_data:
-                        del doc_data[field]
-                
-                data.append(doc_data)
-            except Exception as doc_error:
-                safe_log(f"Error exporting {doctype} {doc.name}: {str(doc_error)}")
+        if writer.count:
+            if manifest:
+                manifest.add(file_path, writer.count, writer.checksum)
+            safe_log(f"Exported {writer.count} {doctype} records with filters to {file_path}")
+            return file_path
         
-        if data:
-            # Write data more carefully
-            try:
-                json_str = json.dumps(data, indent=4, default=str, ensure_ascii=False)
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(json_str)
-                
-                safe_log(f"Exported {len(data)} {doctype} records with filters to {file_path}")
-                return file_path
-            except Exception as write_error:
-                safe_log(f"Error writing filtered {doctype} to file: {str(write_error)}")
+        # Nothing matched - do not leave an empty array behind
+        safe_log(f"No records found for DocType {doctype} with filters {filters}")
+        os.remove(file_path)
     
     except Exception as e:
         safe_log(f"Error exporting DocType {doctype} with filters: {str(e)}")
     
     return None
 
-def export_custom_fields(doctype, fixtures_path):
+def export_custom_fields(doctype, fixtures_path, accumulator=None, manifest=None):
     """Export Custom Fields for a DocType"""
     try:
         file_name = "custom_field.json"
@@ -904,17 +1328,6 @@ def export_custom_fields(doctype, fixtures_path):
                 "__export_placeholder": True  # Mark as placeholder
             }]
         
-        # Check if file exists and read existing data
-        existing_data = []
-        if os.path.exists(file_path) and os.path.getsize(file_path) > 2:
-            try:
-                with open(file_path, 'r') as f:
-                    existing_data = json.load(f)
-                    if not isinstance(existing_data, list):
-                        existing_data = []
-            except:
-                existing_data = []
-        
         # Get custom field data
         new_data = []
         for cf in custom_fields:
@@ -936,28 +1349,11 @@ def export_custom_fields(doctype, fixtures_path):
                 safe_log(f"Error exporting Custom Field for {doctype}: {str(cf_error)}")
         
         if new_data:
-            # Merge with existing data, avoiding duplicates
-            all_data = existing_data.copy() if existing_data else []
-            
-            # Get existing dt/fieldname combinations
-            existing_keys = set()
-            for item in all_data:
-                if item.get("dt") and item.get("fieldname"):
-                    existing_keys.add((item.get("dt"), item.get("fieldname")))
-            
-            # Add new items avoiding duplicates
-            for item in new_data:
-                key = (item.get("dt"), item.get("fieldname"))
-                if key not in existing_keys:
-                    all_data.append(item)
-                    existing_keys.add(key)
-            
-            # Remove placeholder entries if we have real data
-            if len(all_data) > 1:
-                all_data = [item for item in all_data if not item.get("__export_placeholder")]
-            
-            with open(file_path, 'w') as f:
-                json.dump(all_data, f, indent=4)
+            # Merge into the job's accumulator; without one, merge into the file right away
+            file_accumulator = accumulator or FixtureAccumulator(file_path)
+            file_accumulator.add(new_data)
+            if not accumulator:
+                file_accumulator.flush(manifest)
             
             safe_log(f"Exported {len(new_data)} Custom Fields for {doctype} to {file_path}")
             return file_path
@@ -967,7 +1363,7 @@ def export_custom_fields(doctype, fixtures_path):
     
     return None
 
-def export_custom_fields_with_filters(filters, fixtures_path):
+def export_custom_fields_with_filters(filters, fixtures_path, accumulator=None, manifest=None):
     """Export Custom Fields with filters"""
     try:
         file_name = "custom_field.json"
@@ -987,17 +1383,6 @@ def export_custom_fields_with_filters(filters, fixtures_path):
             safe_log(f"No custom fields found with filters {filters}")
             return None
         
-        # Check if file exists and read existing data
-        existing_data = []
-        if os.path.exists(file_path) and os.path.getsize(file_path) > 2:
-            try:
-                with open(file_path, 'r') as f:
-                    existing_data = json.load(f)
-                    if not isinstance(existing_data, list):
-                        existing_data = []
-            except:
-                existing_data = []
-        
         # Process custom field data
         new_data = []
         for cf in custom_fields:
@@ -1019,24 +1404,11 @@ def export_custom_fields_with_filters(filters, fixtures_path):
                 safe_log(f"Error exporting Custom Field with filters: {str(cf_error)}")
         
         if new_data:
-            # Merge with existing data, avoiding duplicates
-            all_data = existing_data.copy() if existing_data else []
-            
-            # Get existing dt/fieldname combinations
-            existing_keys = set()
-            for item in all_data:
-                if item.get("dt") and item.get("fieldname"):
-                    existing_keys.add((item.get("dt"), item.get("fieldname")))
-            
-            # Add new items avoiding duplicates
-            for item in new_data:
-                key = (item.get("dt"), item.get("fieldname"))
-                if key not in existing_keys:
-                    all_data.append(item)
-                    existing_keys.add(key)
-            
-            with open(file_path, 'w') as f:
-                json.dump(all_data, f, indent=4)
+            # Merge into the job's accumulator; without one, merge into the file right away
+            file_accumulator = accumulator or FixtureAccumulator(file_path)
+            file_accumulator.add(new_data)
+            if not accumulator:
+                file_accumulator.flush(manifest)
             
             safe_log(f"Exported {len(new_data)} Custom Fields with filters to {file_path}")
             return file_path
@@ -1046,7 +1418,7 @@ def export_custom_fields_with_filters(filters, fixtures_path):
     
     return None
 
-def export_property_setters(doctype, fixtures_path):
+def export_property_setters(doctype, fixtures_path, accumulator=None, manifest=None):
     """Export Property Setters for a DocType"""
     try:
         file_name = "property_setter.json"
@@ -1082,17 +1454,6 @@ def export_property_setters(doctype, fixtures_path):
                 "__export_placeholder": True  # Mark as placeholder
             }]
         
-        # Check if file exists and read existing data
-        existing_data = []
-        if os.path.exists(file_path) and os.path.getsize(file_path) > 2:
-            try:
-                with open(file_path, 'r') as f:
-                    existing_data = json.load(f)
-                    if not isinstance(existing_data, list):
-                        existing_data = []
-            except:
-                existing_data = []
-        
         # Get property setter data
         new_data = []
         for ps in property_setters:
@@ -1114,28 +1475,11 @@ def export_property_setters(doctype, fixtures_path):
                 safe_log(f"Error exporting Property Setter for {doctype}: {str(ps_error)}")
         
         if new_data:
-            # Merge with existing data, avoiding duplicates
-            all_data = existing_data.copy() if existing_data else []
-            
-            # Get existing doc_type/property combinations
-            existing_keys = set()
-            for item in all_data:
-                if item.get("doc_type") and item.get("property"):
-                    existing_keys.add((item.get("doc_type"), item.get("property")))
-            
-            # Add new items avoiding duplicates
-            for item in new_data:
-                key = (item.get("doc_type"), item.get("property"))
-                if key not in existing_keys:
-                    all_data.append(item)
-                    existing_keys.add(key)
-            
-            # Remove placeholder entries if we have real data
-            if len(all_data) > 1:
-                all_data = [item for item in all_data if not item.get("__export_placeholder")]
-            
-            with open(file_path, 'w') as f:
-                json.dump(all_data, f, indent=4)
+            # Merge into the job's accumulator; without one, merge into the file right away
+            file_accumulator = accumulator or FixtureAccumulator(file_path)
+            file_accumulator.add(new_data)
+            if not accumulator:
+                file_accumulator.flush(manifest)
             
             safe_log(f"Exported {len(new_data)} Property Setters for {doctype} to {file_path}")
             return file_path
@@ -1145,7 +1489,7 @@ def export_property_setters(doctype, fixtures_path):
     
     return None
 
-def export_property_setters_with_filters(filters, fixtures_path):
+def export_property_setters_with_filters(filters, fixtures_path, accumulator=None, manifest=None):
     """Export Property Setters with filters"""
     try:
         file_name = "property_setter.json"
@@ -1165,17 +1509,6 @@ def export_property_setters_with_filters(filters, fixtures_path):
             safe_log(f"No property setters found with filters {filters}")
             return None
         
-        # Check if file exists and read existing data
-        existing_data = []
-        if os.path.exists(file_path) and os.path.getsize(file_path) > 2:
-            try:
-                with open(file_path, 'r') as f:
-                    existing_data = json.load(f)
-                    if not isinstance(existing_data, list):
-                        existing_data = []
-            except:
-                existing_data = []
-        
         # Process property setter data
         new_data = []
         for ps in property_setters:
@@ -1197,24 +1530,11 @@ def export_property_setters_with_filters(filters, fixtures_path):
                 safe_log(f"Error exporting Property Setter with filters: {str(ps_error)}")
         
         if new_data:
-            # Merge with existing data, avoiding duplicates
-            all_data = existing_data.copy() if existing_data else []
-            
-            # Get existing doc_type/property combinations
-            existing_keys = set()
-            for item in all_data:
-                if item.get("doc_type") and item.get("property"):
-                    existing_keys.add((item.get("doc_type"), item.get("property")))
-            
-            # Add new items avoiding duplicates
-            for item in new_data:
-                key = (item.get("doc_type"), item.get("property"))
-                if key not in existing_keys:
-                    all_data.append(item)
-                    existing_keys.add(key)
-            
-            with open(file_path, 'w') as f:
-                json.dump(all_data, f, indent=4)
+            # Merge into the job's accumulator; without one, merge into the file right away
+            file_accumulator = accumulator or FixtureAccumulator(file_path)
+            file_accumulator.add(new_data)
+            if not accumulator:
+                file_accumulator.flush(manifest)
             
             safe_log(f"Exported {len(new_data)} Property Setters with filters to {file_path}")
             return file_path
@@ -1224,7 +1544,7 @@ def export_property_setters_with_filters(filters, fixtures_path):
     
     return None
 
-def export_client_scripts(filters, fixtures_path):
+def export_client_scripts(filters, fixtures_path, manifest=None):
     """Export Client Scripts with filters"""
     try:
         file_name = "client_script.json"
@@ -1249,17 +1569,6 @@ def export_client_scripts(filters, fixtures_path):
             safe_log("No client scripts found")
             return None
         
-        # Check if file exists and read existing data
-        existing_data = []
-        if os.path.exists(file_path) and os.path.getsize(file_path) > 2:
-            try:
-                with open(file_path, 'r') as f:
-                    existing_data = json.load(f)
-                    if not isinstance(existing_data, list):
-                        existing_data = []
-            except:
-                existing_data = []
-        
         data = []
         for cs in client_scripts:
             try:
@@ -1281,23 +1590,9 @@ def export_client_scripts(filters, fixtures_path):
         
         if data:
             # Merge with existing data, avoiding duplicates
-            all_data = existing_data.copy() if existing_data else []
-            
-            # Get existing dt/name combinations
-            existing_keys = set()
-            for item in all_data:
-                if item.get("dt") and item.get("name"):
-                    existing_keys.add((item.get("dt"), item.get("name")))
-            
-            # Add new items avoiding duplicates
-            for item in data:
-                key = (item.get("dt"), item.get("name"))
-                if key not in existing_keys:
-                    all_data.append(item)
-                    existing_keys.add(key)
-            
-            with open(file_path, 'w') as f:
-                json.dump(all_data, f, indent=4)
+            file_accumulator = FixtureAccumulator(file_path)
+            file_accumulator.add(data)
+            file_accumulator.flush(manifest)
             
             safe_log(f"Exported {len(data)} Client Scripts to {file_path}")
             return file_path
@@ -1307,7 +1602,7 @@ def export_client_scripts(filters, fixtures_path):
     
     return None
 
-def export_server_scripts(filters, fixtures_path):
+def export_server_scripts(filters, fixtures_path, manifest=None):
     """Export Server Scripts with filters"""
     try:
         file_name = "server_script.json"
@@ -1332,17 +1627,6 @@ def export_server_scripts(filters, fixtures_path):
             safe_log("No server scripts found")
             return None
         
-        # Check if file exists and read existing data
-        existing_data = []
-        if os.path.exists(file_path) and os.path.getsize(file_path) > 2:
-            try:
-                with open(file_path, 'r') as f:
-                    existing_data = json.load(f)
-                    if not isinstance(existing_data, list):
-                        existing_data = []
-            except:
-                existing_data = []
-        
         data = []
         for ss in server_scripts:
             try:
@@ -1364,23 +1648,9 @@ def export_server_scripts(filters, fixtures_path):
         
         if data:
             # Merge with existing data, avoiding duplicates
-            all_data = existing_data.copy() if existing_data else []
-            
-            # Get existing name values
-            existing_keys = set()
-            for item in all_data:
-                if item.get("name"):
-                    existing_keys.add(item.get("name"))
-            
-            # Add new items avoiding duplicates
-            for item in data:
-                key = item.get("name")
-                if key not in existing_keys:
-                    all_data.append(item)
-                    existing_keys.add(key)
-            
-            with open(file_path, 'w') as f:
-                json.dump(all_data, f, indent=4)
+            file_accumulator = FixtureAccumulator(file_path)
+            file_accumulator.add(data)
+            file_accumulator.flush(manifest)
             
             safe_log(f"Exported {len(data)} Server Scripts to {file_path}")
             return file_path
@@ -1390,99 +1660,15 @@ def export_server_scripts(filters, fixtures_path):
     
     return None
 
-def fix_empty_json_files(app_info, export_doc):
-    """Fix any empty JSON files by forcing a direct export"""
-    try:
-        fixtures_path = os.path.join(app_info["path"], app_info["name"], "fixtures")
-        
-        # Check for empty or corrupted JSON files
-        empty_files = []
-        for root, dirs, files in os.walk(fixtures_path):
-            for file in files:
-                if file.endswith('.json'):
-                    file_path = os.path.join(root, file)
-                    # File is empty or just contains "{}"
-                    if os.path.getsize(file_path) <= 5:
-                        empty_files.append((file_path, file.replace('.json', '')))
-                    else:
-                        # Check if file is valid JSON
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                                if not content.strip() or content.strip() in ['{}', '[]']:
-                                    empty_files.append((file_path, file.replace('.json', '')))
-                                else:
-                                    # Try to parse it
-                                    json.loads(content)
-                        except:
-                            # If we can't parse it, consider it corrupted
-                            empty_files.append((file_path, file.replace('.json', '')))
-        
-        safe_log(f"Found {len(empty_files)} empty/corrupted JSON files")
-        
-        # Fix empty/corrupted files
-        for file_path, file_name in empty_files:
-            # Try to determine what kind of file this is
-            if file_name == "custom_field":
-                # Force export of all Custom Fields for all DocTypes
-                if export_doc.get('export_doctypes'):
-                    for dt_entry in export_doc['export_doctypes']:
-                        if dt_entry.get('doctype_name'):
-                            try:
-                                export_custom_fields(dt_entry['doctype_name'], fixtures_path)
-                            except Exception as e:
-                                safe_log(f"Error fixing custom_field.json: {str(e)}")
-            
-            elif file_name == "property_setter":
-                # Force export of all Property Setters for all DocTypes
-                if export_doc.get('export_doctypes'):
-                    for dt_entry in export_doc['export_doctypes']:
-                        if dt_entry.get('doctype_name'):
-                            try:
-                                export_property_setters(dt_entry['doctype_name'], fixtures_path)
-                            except Exception as e:
-                                safe_log(f"Error fixing property_setter.json: {str(e)}")
-            
-            elif file_name == "client_script":
-                # Force export of Client Scripts
-                try:
-                    export_client_scripts(None, fixtures_path)
-                except Exception as e:
-                    safe_log(f"Error fixing client_script.json: {str(e)}")
-            
-            elif file_name == "server_script":
-                # Force export of Server Scripts
-                try:
-                    export_server_scripts(None, fixtures_path)
-                except Exception as e:
-                    safe_log(f"Error fixing server_script.json: {str(e)}")
-            
-            else:
-                # This might be a DocType - try direct export
-                try:
-                    # Try different case formats: snake_case, Title Case, etc.
-                    possible_doctypes = [
-                        file_name,  # as is
-                        file_name.replace('_', ' ').title(),  # snake_case to Title Case
-                        file_name.title()  # lowercase to Title Case
-                    ]
-                    
-                    for doctype in possible_doctypes:
-                        if frappe.db.exists("DocType", doctype):
-                            try:
-                                # Found a matching DocType, export it
-                                export_doctype(doctype, fixtures_path)
-                                break
-                            except Exception as dt_error:
-                                safe_log(f"Error fixing {file_name}.json: {str(dt_error)}")
-                except Exception as e:
-                    safe_log(f"Error determining DocType for {file_name}: {str(e)}")
+def save_exported_files(exported_files, doctype_name, attach_individual_files=False):
+    """
+    Save exported JSON files to File DocType and return file links
     
-    except Exception as e:
-        safe_log(f"Error in fix_empty_json_files: {str(e)}")
-
-def save_exported_files(exported_files, doctype_name):
-    """Save exported JSON files to File DocType and return file links"""
+    The ZIP holding all files is always attached. The individual JSON files
+    are only attached when attach_individual_files is set, since the ZIP
+    already contains them. Existing attachments are looked up with one query,
+    so only the missing File records are inserted.
+    """
     file_links = []
     
     if not exported_files:
@@ -1491,100 +1677,79 @@ def save_exported_files(exported_files, doctype_name):
     
     timestamp = now().replace(':', '-').replace(' ', '_')
     zip_filename = f"customizations_export_{timestamp}.zip"
+    zip_filepath = None
+    
+    # All files already attached to the document, by file name
+    existing_files = {
+        f.file_name: f for f in frappe.get_all(
+            "File",
+            filters={
+                "attached_to_doctype": "Export Customizations Module",
+                "attached_to_name": doctype_name
+            },
+            fields=["name", "file_name", "file_url"]
+        )
+    }
+    
+    # Track filenames to avoid duplicates in ZIP - add a counter if needed
+    members = []
+    added_files = set()
+    for file_path in exported_files:
+        file_name = os.path.basename(file_path)
+        base_name = file_name
+        counter = 1
+        while file_name in added_files:
+            name_parts = base_name.rsplit('.', 1)
+            if len(name_parts) > 1:
+                file_name = f"{name_parts[0]}_{counter}.{name_parts[1]}"
+            else:
+                file_name = f"{base_name}_{counter}"
+            counter += 1
+        
+        added_files.add(file_name)
+        members.append((file_path, file_name))
+    
+    # Check if zip already exists - delete it before writing so its
+    # on-disk file cannot be confused with the new archive
+    existing_zip = existing_files.get(zip_filename)
+    if existing_zip:
+        # Delete existing zip to avoid accumulation
+        try:
+            frappe.delete_doc("File", existing_zip.name)
+            frappe.db.commit()
+            safe_log(f"Deleted existing ZIP file {existing_zip.name}")
+        except Exception as del_error:
+            safe_log(f"Error deleting existing ZIP: {str(del_error)}")
     
+    # Only the File records of a failed attempt are undone, not the export status updates
+    frappe.db.savepoint("save_exported_files")
     try:
-        import zipfile
-        from io import BytesIO
-        
-        # Create a zip file in memory
-        zip_buffer = BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            # Track filenames to avoid duplicates in ZIP
-            added_files = set()
-            
-            for file_path in exported_files:
-                file_name = os.path.basename(file_path)
-                
-                # Check for duplicate filenames - add a counter if needed
-                base_name = file_name
-                counter = 1
-                while file_name in added_files:
-                    name_parts = base_name.rsplit('.', 1)
-                    if len(name_parts) > 1:
-                        file_name = f"{name_parts[0]}_{counter}.{name_parts[1]}"
-                    else:
-                        file_name = f"{base_name}_{counter}"
-                    counter += 1
-                
-                added_files.add(file_name)
-                
-                with open(file_path, 'rb') as f:
-                    file_content = f.read()
-                    zip_file.writestr(file_name, file_content)
-                
-                # Skip saving individual file if it already exists in File DocType
-                existing_file = frappe.get_all("File", 
-                                             filters={
-                                                 "file_name": file_name,
-                                                 "attached_to_doctype": "Export Customizations Module",
-                                                 "attached_to_name": doctype_name
-                                             },
-                                             fields=["name", "file_url"])
-                
+        # Create the zip file directly in the private files store, copied from disk in chunks
+        zip_filepath = get_private_file_path(zip_filename)
+        write_zip_archive(zip_filepath, members, compression=zipfile.ZIP_DEFLATED)
+        
+        if attach_individual_files:
+            # Skip saving individual files that already exist in File DocType
+            new_members = []
+            for file_path, file_name in members:
+                existing_file = existing_files.get(file_name)
                 if existing_file:
                     file_links.append({
-                        "name": existing_file[0].name,
+                        "name": existing_file.name,
                         "file_name": file_name,
-                        "file_url": existing_file[0].file_url
+                        "file_url": existing_file.file_url
                     })
-                    continue
-                
-                # Save individual JSON file
-                try:
-                    file_doc = save_file(
-                        fname=file_name,
-                        content=file_content,
-                        dt="Export Customizations Module",
-                        dn=doctype_name,
-                        folder="Home/Attachments",
-                        is_private=1
-                    )
-                    
-                    file_links.append({
-                        "name": file_doc.name,
-                        "file_name": file_doc.file_name,
-                        "file_url": file_doc.file_url
-                    })
-                except Exception as file_error:
-                    safe_log(f"Error saving individual file {file_name}: {str(file_error)}")
-        
-        # Check if zip already exists
-        existing_zip = frappe.get_all("File", 
-                                     filters={
-                                         "file_name": zip_filename,
-                                         "attached_to_doctype": "Export Customizations Module",
-                                         "attached_to_name": doctype_name
-                                     },
-                                     fields=["name", "file_url"])
-        
-        if existing_zip:
-            # Delete existing zip to avoid accumulation
-            try:
-                frappe.delete_doc("File", existing_zip[0].name)
-                frappe.db.commit()
-                safe_log(f"Deleted existing ZIP file {existing_zip[0].name}")
-            except Exception as del_error:
-                safe_log(f"Error deleting existing ZIP: {str(del_error)}")
-        
-        # Save the zip file
-        zip_buffer.seek(0)
-        zip_file_doc = save_file(
-            fname=zip_filename,
-            content=zip_buffer.getvalue(),
-            dt="Export Customizations Module",
-            dn=doctype_name,
-            folder="Home/Attachments",
-            is_private=1
+                else:
+                    new_members.append((file_path, file_name))
+            
+            file_links.extend(attach_private_files(new_members, "Export Customizations Module", doctype_name))
+        
+        # Attach the zip file without reading it back into memory
+        zip_file_doc = attach_private_file(
+            zip_filepath,
+            "Export Customizations Module",
+            doctype_name,
+            folder="Home/Attachments"
         )
         
         file_links.append({
@@ -1599,63 +1764,52 @@ def save_exported_files(exported_files, doctype_name):
     except Exception as e:
         safe_log(f"Error saving exported files: {str(e)}")
         frappe.msgprint(f"Error creating zip file: {str(e)}")
+        frappe.db.rollback(save_point="save_exported_files")
+        file_links = []
         
-        # If zip fails, at least try to save individual files
-        for file_path in exported_files:
+        # Remove a partially written archive
+        if zip_filepath and os.path.isfile(zip_filepath):
             try:
-                file_name = os.path.basename(file_path)
-                with open(file_path, 'rb') as f:
-                    file_content = f.read()
-                
-                file_doc = save_file(
-                    fname=file_name,
-                    content=file_content,
-                    dt="Export Customizations Module",
-                    dn=doctype_name,
-                    folder="Home/Attachments",
-                    is_private=1
-                )
-                
-                file_links.append({
-                    "name": file_doc.name,
-                    "file_name": file_doc.file_name,
-                    "file_url": file_doc.file_url
-                })
-            except Exception as inner_e:
-                safe_log(f"Error saving file {file_path}: {str(inner_e)}")
+                os.remove(zip_filepath)
+            except OSError:
+                pass
+        
+        # If zip fails, at least try to save individual files
+        try:
+            file_links = attach_private_files(members, "Export Customizations Module", doctype_name)
+            frappe.db.commit()
+        except Exception as inner_e:
+            safe_log(f"Error saving files: {str(inner_e)}")
     
     return file_links
 
-def send_exported_files_email(emails, file_links, doctype_name):
-    """Send email with exported files as attachments"""
+def send_exported_files_email(emails, file_links, doctype_name, email_attachment_limit=None):
+    """Send one email with exported files as attachments to all recipients"""
     email_list = [email['email'] for email in emails if email.get('email')]
     
     if not email_list:
         return False
     
-    # Prepare attachments
-    attachments = []
-    
     # Prefer the zip file if it exists
     zip_file = next((f for f in file_links if f.get('is_zip')), None)
     
     if zip_file:
         # Only attach the zip file to avoid large emails
-        file_doc = frappe.get_doc("File", zip_file['name'])
-        if file_doc and file_doc.file_url:
-            attachments.append({
-                "fname": file_doc.file_name,
-                "fcontent": file_doc.get_content()
-            })
+        file_names = [zip_file['name']]
     else:
         # If no zip file, attach individual files (up to a reasonable limit)
-        for i, file_link in enumerate(file_links[:10]):  # Limit to 10 files
-            file_doc = frappe.get_doc("File", file_link['name'])
-            if file_doc and file_doc.file_url:
-                attachments.append({
-                    "fname": file_doc.file_name,
-                    "fcontent": file_doc.get_content()
-                })
+        file_names = [file_link['name'] for file_link in file_links[:10]]  # Limit to 10 files
+    
+    file_docs = frappe.get_all(
+        "File",
+        filters={"name": ["in", file_names]},
+        fields=["name", "file_name", "file_size"],
+        order_by="creation asc"
+    )
+    
+    # Attach by File reference, so the queued email does not hold the content;
+    # files above the attachment limit are sent as expiring download links
+    attachments, links = get_export_email_content(file_docs, email_attachment_limit)
     
     # Send email
     subject = f"ERPNext Customizations Export - {doctype_name}"
@@ -1666,6 +1820,7 @@ def send_exported_files_email(emails, file_links, doctype_name):
     <ul>
         {''.join([f'<li>{file_link["file_name"]}</li>' for file_link in file_links])}
     </ul>
+    {get_links_html(links)}
     <p>Regards,<br>ERPNext System</p>
     """
     
@@ -1690,7 +1845,7 @@ def get_export_status(doctype_name):
             "export_status": doc.get("export_status", "Not Started"),
             "export_message": doc.get("export_message", ""),
             "last_export_update": doc.get("last_export_update", ""),
-            "completed": doc.get("export_status") in ["Completed", "Completed with warnings", "Failed"]
+            "completed": doc.get("export_status") in ["Completed", "Completed with warnings", "Partial", "Failed"]
         }
         
         # If completed, get the file links
@@ -1710,28 +1865,30 @@ def get_export_status(doctype_name):
             "completed": True
         }
 
-def safe_log(message, title="Export Fixtures"):
-    """Log a message safely, ensuring it doesn't exceed character limits"""
+def safe_log(message, title="Export Fixtures", level=None):
+    """
+    Log a message safely, ensuring it doesn't exceed character limits
+    
+    Within an export job, messages are buffered and written as one Error Log
+    when the job ends (see export_log), so logging does not insert and commit
+    per message. Outside of one (e.g. a web request) the message is written
+    on its own and committed with the request.
+    """
     try:
         # Limit title length
         if len(title) > 100:
             title = title[:97] + "..."
         
-        # Limit message length for the log title field
-        short_message = message
-        if len(short_message) > 100:
-            short_message = short_message[:97] + "..."
+        if not level:
+            level = "Error" if "error" in title.lower() or "error" in message[:100].lower() else "Info"
         
-        # Use frappe db directly to avoid validation issues
-        error_log = frappe.new_doc("Error Log")
-        error_log.error = message
-        error_log.method = frappe.utils.get_current_site() + " | " + title
-        error_log.title = short_message
-        
-        # Insert directly with db_insert to bypass validation
-        error_log.db_insert()
-        frappe.db.commit()
+        export_log = get_export_log()
+        if export_log:
+            export_log.log(message, title, level)
+        else:
+            # A single message is titled with its own start, as before buffering
+            write_error_log(message, message, title)
     except Exception as e:
         # If even this fails, print to console as last resort
         print(f"ERROR LOGGING FAILED: {str(e)}")
-        print(f"Original message: {message[:200]}...")
\ No newline at end of file
+        print(f"Original message: {message[:200]}...")
@@ -1,9 +1,138 @@
 # Copyright (c) 2025, ahmadmohammad96 and Contributors
 # See license.txt
 
-# import frappe
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from export_import_app.export_import_app.doctype.export_customizations_module import test as export_job
+from export_import_app.export_import_app.doctype.export_customizations_module.json_stream import (
+	JSONArrayWriter,
+	write_json_records,
+)
+from export_import_app.export_import_app.doctype.export_customizations_module.manifest import ExportManifest
+
 
 class TestExportCustomizationsModule(FrappeTestCase):
-	pass
+	def test_streamed_json_matches_json_dump(self):
+		records = [
+			{"doctype": "Custom Field", "dt": "Employee", "fieldname": "custom_straße", "options": "A\nB"},
+			{"doctype": "Custom Field", "nested": [1, {"a": []}], "empty": {}},
+		]
+
+		with tempfile.TemporaryDirectory() as tmpdir:
+			filepath = os.path.join(tmpdir, "records.json")
+			for ensure_ascii in (True, False):
+				for data in (records, []):
+					write_json_records(filepath, iter(data), ensure_ascii=ensure_ascii)
+					with open(filepath, encoding="utf-8") as f:
+						self.assertEqual(
+							f.read(), json.dumps(data, indent=4, default=str, ensure_ascii=ensure_ascii)
+						)
+
+	def test_manifest_entry_matches_written_file(self):
+		with tempfile.TemporaryDirectory() as tmpdir:
+			filepath = os.path.join(tmpdir, "custom_field.json")
+			with JSONArrayWriter(filepath, ensure_ascii=False) as writer:
+				writer.write({"doctype": "Custom Field", "dt": "Employee", "fieldname": "custom_straße"})
+
+			manifest = ExportManifest()
+			entry = manifest.add_writer(writer)
+
+			with open(filepath, "rb") as f:
+				content = f.read()
+			self.assertEqual(entry["checksum"], hashlib.sha256(content).hexdigest())
+			self.assertEqual(entry["size"], len(content))
+			self.assertEqual(entry["count"], 1)
+			self.assertEqual(manifest.get_files(), [filepath])
+
+	def test_resumed_json_matches_json_dump(self):
+		records = [{"doctype": "Note", "name": f"note-{i}", "title": f"Straße {i}"} for i in range(3)]
+
+		with tempfile.TemporaryDirectory() as tmpdir:
+			filepath = os.path.join(tmpdir, "note.json")
+
+			# Interrupted after the third record, with a checkpoint after the second
+			writer = JSONArrayWriter(filepath, ensure_ascii=False)
+			writer.write(records[0])
+			writer.write(records[1])
+			writer.flush()
+			offset, count = writer.offset, writer.count
+			writer.write(records[2])
+			writer.close()
+
+			with JSONArrayWriter(filepath, ensure_ascii=False, offset=offset, count=count) as writer:
+				writer.write(records[2])
+
+			with open(filepath, "rb") as f:
+				content = f.read()
+			self.assertEqual(content.decode("utf-8"), json.dumps(records, indent=4, default=str, ensure_ascii=False))
+			self.assertEqual(writer.checksum, hashlib.sha256(content).hexdigest())
+			self.assertEqual(writer.count, 3)
+
+	def test_interrupted_part_export_resumes_in_a_new_run(self):
+		doctype = "Export Resume Test"
+		docname = "export-resume-test"
+		if not frappe.db.exists("DocType", doctype):
+			frappe.get_doc(
+				{
+					"doctype": "DocType",
+					"name": doctype,
+					"module": "Custom",
+					"custom": 1,
+					"autoname": "field:title",
+					"fields": [{"fieldname": "title", "fieldtype": "Data", "label": "Title", "unique": 1}],
+					"permissions": [{"role": "System Manager", "read": 1}],
+				}
+			).insert()
+		# Creating the table commits, so drop the DocType (and its records) explicitly
+		self.addCleanup(frappe.delete_doc, "DocType", doctype, force=True, ignore_permissions=True)
+		names = [f"record-{i}" for i in range(5)]
+		for name in names:
+			if not frappe.db.exists(doctype, name):
+				frappe.get_doc({"doctype": doctype, "title": name}).insert()
+
+		iter_export_records = export_job.iter_export_records
+		resumed_after = []
+
+		def interrupted(*args, **kwargs):
+			for i, record in enumerate(iter_export_records(*args, **kwargs)):
+				if i == 3:
+					raise Exception("Worker killed")
+				yield record
+
+		def resumed(*args, **kwargs):
+			resumed_after.append(kwargs.get("after"))
+			return iter_export_records(*args, **kwargs)
+
+		def run_part(iter_records):
+			group_id = frappe.generate_hash(length=12)
+			self.addCleanup(frappe.cache().delete_value, f"customization_export_parts_done:{group_id}")
+			with patch.object(export_job, "EXPORT_CHECKPOINT_INTERVAL", 2), patch.object(
+				export_job, "iter_export_records", iter_records
+			):
+				export_job.export_fixtures_part(docname, {}, {}, group_id, 0, 2, "DocType", doctype)
+			return os.path.join(export_job.get_export_parts_path(group_id, 0), frappe.scrub(doctype) + ".json")
+
+		resume_path = export_job.get_export_resume_path(docname)
+		self.addCleanup(shutil.rmtree, resume_path, ignore_errors=True)
+
+		# The first run stops after the third record, with a checkpoint after the second
+		part_file = run_part(interrupted)
+		self.addCleanup(shutil.rmtree, os.path.dirname(os.path.dirname(part_file)), ignore_errors=True)
+		self.assertFalse(os.path.exists(part_file))
+
+		# The retry runs in another parts directory and still continues from the checkpoint
+		part_file = run_part(resumed)
+		self.addCleanup(shutil.rmtree, os.path.dirname(os.path.dirname(part_file)), ignore_errors=True)
+		self.assertEqual(resumed_after, [names[1]])
+
+		with open(part_file) as f:
+			self.assertEqual([record["name"] for record in json.load(f)], names)
+		self.assertEqual(os.listdir(resume_path), [])
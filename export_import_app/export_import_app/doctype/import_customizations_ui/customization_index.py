@@ -0,0 +1,154 @@
+# Copyright (c) 2025, ahmadmohammad96 and contributors
+# For license information, please see license.txt
+
+import hashlib
+import json
+import numbers
+
+import frappe
+from frappe.utils import cstr
+
+# Left out of content hashes, since they differ between sites for identical records
+SYSTEM_FIELDS = frozenset(
+	("name", "owner", "creation", "modified", "modified_by", "docstatus", "idx", "parent", "parentfield", "parenttype")
+)
+
+
+def _custom_field_key(data):
+	if data.get("dt") and data.get("fieldname"):
+		return (data["dt"], data["fieldname"])
+
+
+def _property_setter_key(data):
+	if data.get("doc_type") and data.get("property"):
+		doctype_or_field = data.get("doctype_or_field") or ("DocField" if data.get("field_name") else "DocType")
+		return (data["doc_type"], doctype_or_field, data.get("field_name") or None, data["property"])
+
+
+def _client_script_key(data):
+	# Without a view, any Client Script of the DocType matches
+	if data.get("dt"):
+		return (data["dt"], data.get("view") or None)
+
+
+def _server_script_key(data):
+	# Only a script bound to something unique is matched by key; any other
+	# script is matched by name alone, so scripts without a reference DocType
+	# (e.g. several Scheduler Event scripts) never overwrite each other
+	script_type = data.get("script_type")
+	reference_doctype = data.get("reference_doctype") or data.get("dt")
+	if script_type == "API":
+		return ("API", data["api_method"]) if data.get("api_method") else None
+	if script_type == "Scheduler Event" or not reference_doctype:
+		return None
+	return (reference_doctype, script_type or None, data.get("doctype_event") or None)
+
+
+# Per DocType: the columns to load, the field filtered by the DocTypes of the
+# bundle (None loads every record) and the natural key records are matched by
+KEYS = {
+	"Custom Field": (["dt", "fieldname"], "dt", _custom_field_key),
+	"Property Setter": (["doc_type", "doctype_or_field", "field_name", "property"], "doc_type", _property_setter_key),
+	"Client Script": (["dt", "view"], "dt", _client_script_key),
+	"Server Script": (["reference_doctype", "script_type", "doctype_event", "api_method"], None, _server_script_key),
+}
+
+
+def get_content_hash(columns, data):
+	"""sha256 of the normalised values of columns in data (a stored row or an imported record)"""
+	values = [_normalize(data.get(column)) for column in columns]
+	return hashlib.sha256(json.dumps(values).encode()).hexdigest()
+
+
+def _normalize(value):
+	# None and "" are stored alike, and numbers may come back as Decimal or int
+	if value is None or value == "":
+		return None
+	if isinstance(value, numbers.Number):
+		return float(value)
+	return cstr(value)
+
+
+class CustomizationIndex:
+	"""Existing customizations an import can match, loaded with one query per DocType
+
+	Records are matched by name first, then by their natural key, like the
+	frappe.db.exists / frappe.get_all lookups they replace, but each match is
+	a dict lookup. Records created during the import are added, so a later
+	record with the same key updates them instead of creating a duplicate.
+
+	A content hash of every stored row is kept as well, so an imported
+	record identical to the stored one can be skipped without loading it.
+	"""
+
+	def __init__(self, records_by_doctype):
+		"""
+		Args:
+			records_by_doctype (dict): Incoming records per DocType, e.g. {"Custom Field": [...]}
+		"""
+		self.names = {}
+		self.keys = {}
+		self.columns = {}
+		self.hashes = {}
+
+		for doctype, records in records_by_doctype.items():
+			self._load(doctype, records)
+
+	@classmethod
+	def for_customizations(cls, customizations):
+		"""Build the index for the "customizations" section of an import file"""
+		records_by_doctype = {doctype: [] for doctype in KEYS}
+
+		for doctype_data in (customizations.get("doctypes") or {}).values():
+			records_by_doctype["Custom Field"].extend(doctype_data.get("custom_fields") or [])
+			records_by_doctype["Property Setter"].extend(doctype_data.get("property_setters") or [])
+
+		records_by_doctype["Client Script"].extend((customizations.get("client_scripts") or {}).values())
+		records_by_doctype["Server Script"].extend((customizations.get("server_scripts") or {}).values())
+
+		return cls(records_by_doctype)
+
+	def _load(self, doctype, records):
+		columns, doctype_field, _get_key = KEYS[doctype]
+		self.names[doctype] = set()
+		self.keys[doctype] = {}
+		self.hashes[doctype] = {}
+		self.columns[doctype] = [
+			column for column in frappe.get_meta(doctype).get_valid_columns() if column not in SYSTEM_FIELDS
+		]
+		if not records:
+			return
+
+		or_filters = None
+		if doctype_field:
+			doctypes = list({record[doctype_field] for record in records if record.get(doctype_field)})
+			names = [record["name"] for record in records if record.get("name")]
+			or_filters = [[doctype_field, "in", doctypes or [""]], ["name", "in", names or [""]]]
+
+		# Same default order as the get_all lookups, so the same record is matched first
+		fields = ["name"] + columns + [column for column in self.columns[doctype] if column not in columns]
+		for row in frappe.get_all(doctype, fields=fields, or_filters=or_filters):
+			self.add(doctype, row.name, row)
+
+	def find(self, doctype, data):
+		"""Return the name of the existing record matching data, or None"""
+		if data.get("name") in self.names[doctype]:
+			return data["name"]
+
+		key = KEYS[doctype][2](data)
+		return self.keys[doctype].get(key) if key else None
+
+	def is_unchanged(self, doctype, name, data):
+		"""Whether data holds the same values as the stored record name"""
+		return self.hashes[doctype].get(name) == get_content_hash(self.columns[doctype], data)
+
+	def add(self, doctype, name, data):
+		"""Index a record, e.g. one that was just inserted or updated"""
+		self.names[doctype].add(name)
+		self.hashes[doctype][name] = get_content_hash(self.columns[doctype], data)
+
+		key = KEYS[doctype][2](data)
+		if key:
+			self.keys[doctype].setdefault(key, name)
+		if doctype == "Client Script" and key and key[1]:
+			self.keys[doctype].setdefault((key[0], None), name)
@@ -9,7 +9,10 @@ class ImportCustomizationsUI(Document):
 	pass
 import frappe
 import json
+from contextlib import contextmanager
 from datetime import datetime
+from frappe.utils import cstr
+from export_import_app.export_import_app.doctype.import_customizations_ui.customization_index import CustomizationIndex
 
 @frappe.whitelist()
 def import_customizations(doc_name):
@@ -43,19 +46,30 @@ def import_customizations(doc_name):
         if not import_data.get("customizations"):
             frappe.throw("Invalid customization file format. Missing 'customizations' section.")
         
+        # Load the existing customizations the file can match once, instead of per record
+        index = CustomizationIndex.for_customizations(import_data["customizations"])
+        
+        # DocTypes whose cache is cleared once, after all records are imported
+        affected_doctypes = set()
+        
         # Start import process
         summary = {
             "doctypes_processed": 0,
             "custom_fields_created": 0,
             "custom_fields_updated": 0,
+            "custom_fields_unchanged": 0,
             "property_setters_created": 0,
             "property_setters_updated": 0,
+            "property_setters_unchanged": 0,
             "client_scripts_created": 0,
             "client_scripts_updated": 0,
+            "client_scripts_unchanged": 0,
             "server_scripts_created": 0,
             "server_scripts_updated": 0,
+            "server_scripts_unchanged": 0,
             "custom_doctypes_created": 0,
             "custom_doctypes_updated": 0,
+            "custom_doctypes_unchanged": 0,
             "errors": []
         }
         
@@ -69,30 +83,32 @@ def import_customizations(doc_name):
                     # 1. If it's a custom doctype, create or update it
                     if doctype_data.get("is_custom") and doctype_data.get("doctype_definition"):
                         try:
-                            import_custom_doctype(doctype_data, summary)
+                            import_custom_doctype(doctype_data, summary, affected_doctypes)
                         except Exception as e:
                             summary["errors"].append(f"Error importing custom DocType {doctype_name}: {str(e)}")
                     
                     # 2. Process custom fields
                     if doctype_data.get("custom_fields"):
-                        for custom_field in doctype_data["custom_fields"]:
-                            try:
-                                import_custom_field(custom_field, summary)
-                            except Exception as e:
-                                summary["errors"].append(f"Error importing Custom Field {custom_field.get('fieldname')} for {doctype_name}: {str(e)}")
+                        with defer_custom_field_schema_sync(summary) as schema_doctypes:
+                            for custom_field in doctype_data["custom_fields"]:
+                                try:
+                                    if import_custom_field(custom_field, summary, index, affected_doctypes):
+                                        schema_doctypes.add(custom_field.get("dt") or doctype_name)
+                                except Exception as e:
+                                    summary["errors"].append(f"Error importing Custom Field {custom_field.get('fieldname')} for {doctype_name}: {str(e)}")
                     
                     # 3. Process property setters
                     if doctype_data.get("property_setters"):
                         for property_setter in doctype_data["property_setters"]:
                             try:
-                                import_property_setter(property_setter, summary)
+                                import_property_setter(property_setter, summary, index, affected_doctypes)
                             except Exception as e:
                                 summary["errors"].append(f"Error importing Property Setter {property_setter.get('property')} for {doctype_name}: {str(e)}")
                     
                     # 4. If single doctype, update its values
                     if doctype_data.get("is_single") and doctype_data.get("single_doc_values"):
                         try:
-                            import_single_doc_values(doctype_name, doctype_data["single_doc_values"], summary)
+                            import_single_doc_values(doctype_name, doctype_data["single_doc_values"], summary, affected_doctypes)
                         except Exception as e:
                             summary["errors"].append(f"Error importing Single DocType values for {doctype_name}: {str(e)}")
                 
@@ -103,7 +119,7 @@ def import_customizations(doc_name):
         if "client_scripts" in import_data["customizations"]:
             for script_name, script_data in import_data["customizations"]["client_scripts"].items():
                 try:
-                    import_client_script(script_data, summary)
+                    import_client_script(script_data, summary, index, affected_doctypes)
                 except Exception as e:
                     summary["errors"].append(f"Error importing Client Script {script_name}: {str(e)}")
         
@@ -111,10 +127,15 @@ def import_customizations(doc_name):
         if "server_scripts" in import_data["customizations"]:
             for script_name, script_data in import_data["customizations"]["server_scripts"].items():
                 try:
-                    import_server_script(script_data, summary)
+                    import_server_script(script_data, summary, index, affected_doctypes)
                 except Exception as e:
                     summary["errors"].append(f"Error importing Server Script {script_name}: {str(e)}")
         
+        # Clear the cache of each affected DocType once, so its meta is not
+        # rebuilt after every record
+        for doctype in sorted(affected_doctypes):
+            frappe.clear_cache(doctype=doctype)
+        
         # Generate summary text
         summary_text = f"""
         Import completed with the following results:
@@ -122,14 +143,19 @@ def import_customizations(doc_name):
         DocTypes processed: {summary["doctypes_processed"]}
         Custom DocTypes created: {summary["custom_doctypes_created"]}
         Custom DocTypes updated: {summary["custom_doctypes_updated"]}
+        Custom DocTypes unchanged: {summary["custom_doctypes_unchanged"]}
         Custom Fields created: {summary["custom_fields_created"]}
         Custom Fields updated: {summary["custom_fields_updated"]}
+        Custom Fields unchanged: {summary["custom_fields_unchanged"]}
         Property Setters created: {summary["property_setters_created"]}
         Property Setters updated: {summary["property_setters_updated"]}
+        Property Setters unchanged: {summary["property_setters_unchanged"]}
         Client Scripts created: {summary["client_scripts_created"]}
         Client Scripts updated: {summary["client_scripts_updated"]}
+        Client Scripts unchanged: {summary["client_scripts_unchanged"]}
         Server Scripts created: {summary["server_scripts_created"]}
         Server Scripts updated: {summary["server_scripts_updated"]}
+        Server Scripts unchanged: {summary["server_scripts_unchanged"]}
         
         Errors: {len(summary["errors"])}
         """
@@ -150,7 +176,37 @@ def import_customizations(doc_name):
         frappe.log_error(f"Import error: {str(e)}", "Customization Import")
         frappe.throw(f"Error importing customizations: {str(e)}")
 
-def import_custom_doctype(doctype_data, summary):
+@contextmanager
+def defer_custom_field_schema_sync(summary):
+    """
+    Insert Custom Fields without changing the table schema for each of them
+    
+    Sets frappe.flags.in_create_custom_fields, as frappe's create_custom_fields
+    does, so Custom Field's on_update skips frappe.db.updatedb. Add the DocTypes
+    of the imported fields to the yielded set; on exit each of them is synced
+    once, which adds all their new columns in one ALTER TABLE.
+    """
+    schema_doctypes = set()
+    in_create_custom_fields = frappe.flags.in_create_custom_fields
+    frappe.flags.in_create_custom_fields = True
+    try:
+        yield schema_doctypes
+    finally:
+        frappe.flags.in_create_custom_fields = in_create_custom_fields
+        for doctype in sorted(schema_doctypes):
+            try:
+                frappe.db.updatedb(doctype)
+            except Exception as e:
+                summary["errors"].append(f"Error updating the table of {doctype} for its Custom Fields: {str(e)}")
+
+def clear_doctype_cache(doctype, affected_doctypes=None):
+    """Clear the cache of a DocType now, or collect it in affected_doctypes to clear at the end of the import"""
+    if affected_doctypes is None:
+        frappe.clear_cache(doctype=doctype)
+    else:
+        affected_doctypes.add(doctype)
+
+def import_custom_doctype(doctype_data, summary, affected_doctypes=None):
     """Import a custom DocType"""
     doctype_name = doctype_data["name"]
     doctype_exists = frappe.db.exists("DocType", doctype_name)
@@ -167,24 +223,17 @@ def import_custom_doctype(doctype_data, summary):
         # Update existing DocType
         doc = frappe.get_doc("DocType", doctype_name)
         
-        # Update fields based on the new definition
-        for key, value in doctype_def.items():
-            if key != "fields" and hasattr(doc, key):
-                setattr(doc, key, value)
+        # Update only the properties that changed in the new definition
+        changed = update_changed_values(doc, {key: value for key, value in doctype_def.items() if key != "fields"})
         
         # Handle fields separately since they are child DocTypes
         if "fields" in doctype_data:
-            # First, remove all existing fields
-            doc.fields = []
-            
-            # Then add all fields from the import
-            for field_data in doctype_data["fields"]:
-                # Clean field data
-                for field in ["creation", "modified", "owner", "modified_by", "docstatus", "idx"]:
-                    if field in field_data:
-                        del field_data[field]
-                
-                doc.append("fields", field_data)
+            changed = update_doctype_fields(doc, doctype_data["fields"]) or changed
+        
+        if not changed:
+            # Identical definition - do not save, validate and sync the schema again
+            summary["custom_doctypes_unchanged"] += 1
+            return
         
         # Save DocType with ignore_permissions
         doc.save(ignore_permissions=True)
@@ -213,37 +262,117 @@ def import_custom_doctype(doctype_data, summary):
         summary["custom_doctypes_created"] += 1
     
     # Clear cache to ensure changes are reflected
-    frappe.clear_cache(doctype=doctype_name)
+    clear_doctype_cache(doctype_name, affected_doctypes)
 
-def import_custom_field(field_data, summary):
+def update_doctype_fields(doc, fields):
+    """
+    Apply the imported fields to an existing DocType, matching them by fieldname
+    
+    Changed properties are updated in place, new fields are added, fields
+    that are not in the import are removed and the import order is kept.
+    
+    Returns:
+        bool: Whether anything changed
+    """
+    changed = False
+    existing_fields = {get_field_key(df): df for df in doc.fields}
+    ordered_fields = []
+    
+    for field_data in fields:
+        # Clean field data
+        for field in ["creation", "modified", "owner", "modified_by", "docstatus", "idx"]:
+            if field in field_data:
+                del field_data[field]
+        
+        df = existing_fields.pop(get_field_key(field_data), None)
+        if df:
+            changed = update_changed_values(df, field_data) or changed
+        else:
+            df = doc.append("fields", field_data)
+            changed = True
+        ordered_fields.append(df)
+    
+    # Whatever was not matched is gone from the definition
+    if existing_fields:
+        changed = True
+    
+    for idx, df in enumerate(ordered_fields, start=1):
+        if df.idx != idx:
+            df.idx = idx
+            changed = True
+    
+    doc.set("fields", ordered_fields)
+    return changed
+
+def get_field_key(field):
+    """Key a DocField is matched by; label and type for the rare field without a fieldname"""
+    return field.get("fieldname") or (field.get("fieldtype"), field.get("label"))
+
+def update_changed_values(doc, values):
+    """Set the values that differ from the document, returning whether any did"""
+    changed = False
+    
+    for key, value in values.items():
+        if key in ("name", "doctype", "parent", "parenttype", "parentfield") or not hasattr(doc, key):
+            continue
+        
+        current = doc.get(key)
+        if isinstance(value, list):
+            # Child tables (e.g. permissions)
+            if is_same_table(current, value):
+                continue
+        elif is_same_value(current, value):
+            continue
+        
+        setattr(doc, key, value)
+        changed = True
+    
+    return changed
+
+def is_same_table(current_rows, rows):
+    """Compare child rows with imported ones, row by row on the imported values"""
+    if len(current_rows or []) != len(rows):
+        return False
+    
+    for current_row, row in zip(current_rows, rows):
+        if not isinstance(row, dict):
+            return False
+        
+        for key, value in row.items():
+            if key in ("name", "creation", "modified", "owner", "modified_by", "docstatus", "idx", "parent", "parenttype", "parentfield"):
+                continue
+            if not is_same_value(current_row.get(key), value):
+                return False
+    
+    return True
+
+def is_same_value(current, value):
+    """Compare a stored value with an imported one, ignoring None/empty and int/float differences"""
+    if current == value or (current in (None, "") and value in (None, "")):
+        return True
+    
+    if isinstance(current, (int, float)) and isinstance(value, (int, float)):
+        return float(current) == float(value)
+    
+    return cstr(current) == cstr(value)
+
+def import_custom_field(field_data, summary, index=None, affected_doctypes=None):
     """Import a Custom Field"""
-    # Check if the field already exists
-    field_exists = False
-    existing_field_name = None
-    
-    if field_data.get("name"):
-        field_exists = frappe.db.exists("Custom Field", field_data["name"])
-        if field_exists:
-            existing_field_name = field_data["name"]
-    
-    if not field_exists and field_data.get("fieldname") and field_data.get("dt"):
-        # Try to find by fieldname and doctype
-        existing_fields = frappe.get_all("Custom Field", 
-            filters={
-                "fieldname": field_data["fieldname"],
-                "dt": field_data["dt"]
-            }
-        )
-        if existing_fields:
-            field_exists = True
-            existing_field_name = existing_fields[0].name
+    # Match an existing field by name, then by doctype and fieldname
+    index = index or CustomizationIndex({"Custom Field": [field_data]})
+    existing_field_name = index.find("Custom Field", field_data)
     
     # Remove system fields
     for field in ["creation", "modified", "owner", "modified_by", "docstatus", "idx"]:
         if field in field_data:
             del field_data[field]
     
-    if field_exists and existing_field_name:
+    if existing_field_name and index.is_unchanged("Custom Field", existing_field_name, field_data):
+        # Identical to the stored record - skip the save, validation and cache clear
+        summary["custom_fields_unchanged"] += 1
+        return False
+    
+    if existing_field_name:
         # Update existing field
         doc = frappe.get_doc("Custom Field", existing_field_name)
         
@@ -253,6 +382,7 @@ def import_custom_field(field_data, summary):
                 setattr(doc, key, value)
         
         doc.save(ignore_permissions=True)
+        index.add("Custom Field", doc.name, doc.as_dict())
         summary["custom_fields_updated"] += 1
     else:
         # Create new custom field
@@ -264,48 +394,32 @@ def import_custom_field(field_data, summary):
                 setattr(doc, key, value)
         
         doc.insert(ignore_permissions=True)
+        index.add("Custom Field", doc.name, doc.as_dict())
         summary["custom_fields_created"] += 1
     
     # Clear cache to ensure changes are reflected
     if field_data.get("dt"):
-        frappe.clear_cache(doctype=field_data["dt"])
+        clear_doctype_cache(field_data["dt"], affected_doctypes)
+    
+    return True
 
-def import_property_setter(property_data, summary):
+def import_property_setter(property_data, summary, index=None, affected_doctypes=None):
     """Import a Property Setter"""
-    # Check if property setter already exists
-    property_exists = False
-    existing_property_name = None
-    
-    if property_data.get("name"):
-        property_exists = frappe.db.exists("Property Setter", property_data["name"])
-        if property_exists:
-            existing_property_name = property_data["name"]
-    
-    if not property_exists and property_data.get("doc_type") and property_data.get("property"):
-        # Try to find by doctype, property, and additional criteria
-        filters = {
-            "doc_type": property_data["doc_type"],
-            "property": property_data["property"]
-        }
-        
-        # Add additional filters based on available fields
-        if property_data.get("doctype_or_field"):
-            filters["doctype_or_field"] = property_data["doctype_or_field"]
-        
-        if property_data.get("field_name"):
-            filters["field_name"] = property_data["field_name"]
-        
-        existing_properties = frappe.get_all("Property Setter", filters=filters)
-        if existing_properties:
-            property_exists = True
-            existing_property_name = existing_properties[0].name
+    # Match an existing property setter by name, then by doctype, field and property
+    index = index or CustomizationIndex({"Property Setter": [property_data]})
+    existing_property_name = index.find("Property Setter", property_data)
     
     # Remove system fields
     for field in ["creation", "modified", "owner", "modified_by", "docstatus", "idx"]:
         if field in property_data:
             del property_data[field]
     
-    if property_exists and existing_property_name:
+    if existing_property_name and index.is_unchanged("Property Setter", existing_property_name, property_data):
+        # Identical to the stored record - skip the save, validation and cache clear
+        summary["property_setters_unchanged"] += 1
+        return False
+    
+    if existing_property_name:
         # Update existing property setter
         doc = frappe.get_doc("Property Setter", existing_property_name)
         
@@ -315,6 +429,7 @@ def import_property_setter(property_data, summary):
                 setattr(doc, key, value)
         
         doc.save(ignore_permissions=True)
+        index.add("Property Setter", doc.name, doc.as_dict())
         summary["property_setters_updated"] += 1
     else:
         # Create new property setter
@@ -326,17 +441,24 @@ def import_property_setter(property_data, summary):
                 setattr(doc, key, value)
         
         doc.insert(ignore_permissions=True)
+        index.add("Property Setter", doc.name, doc.as_dict())
         summary["property_setters_created"] += 1
     
     # Clear cache to ensure changes are reflected
     if property_data.get("doc_type"):
-        frappe.clear_cache(doctype=property_data["doc_type"])
+        clear_doctype_cache(property_data["doc_type"], affected_doctypes)
+    
+    return True
 
-def import_single_doc_values(doctype_name, values_data, summary):
+def import_single_doc_values(doctype_name, values_data, summary, affected_doctypes=None):
     """Import values for a Single DocType"""
     if not frappe.db.exists("DocType", doctype_name):
         raise Exception(f"DocType {doctype_name} not found")
     
+    # Fields added earlier in this import must be in the meta before setting values
+    if affected_doctypes and doctype_name in affected_doctypes:
+        frappe.clear_cache(doctype=doctype_name)
+    
     doctype = frappe.get_meta(doctype_name)
     if not doctype.issingle:
         raise Exception(f"DocType {doctype_name} is not a Single DocType")
@@ -356,38 +478,25 @@ def import_single_doc_values(doctype_name, values_data, summary):
     doc.save(ignore_permissions=True)
     
     # Clear cache
-    frappe.clear_cache(doctype=doctype_name)
+    clear_doctype_cache(doctype_name, affected_doctypes)
 
-def import_client_script(script_data, summary):
+def import_client_script(script_data, summary, index=None, affected_doctypes=None):
     """Import a Client Script"""
-    # Check if script already exists
-    script_exists = False
-    existing_script_name = None
-    
-    if script_data.get("name"):
-        script_exists = frappe.db.exists("Client Script", script_data["name"])
-        if script_exists:
-            existing_script_name = script_data["name"]
-    
-    # If not found by name, try to find by doctype (dt)
-    if not script_exists and script_data.get("dt"):
-        # For Client Scripts, usually there is one per doctype/view combination
-        filters = {"dt": script_data["dt"]}
-        
-        if script_data.get("view"):
-            filters["view"] = script_data["view"]
-            
-        existing_scripts = frappe.get_all("Client Script", filters=filters)
-        if existing_scripts:
-            script_exists = True
-            existing_script_name = existing_scripts[0].name
+    # Match an existing script by name, then by doctype (dt) and view
+    index = index or CustomizationIndex({"Client Script": [script_data]})
+    existing_script_name = index.find("Client Script", script_data)
     
     # Remove system fields
     for field in ["creation", "modified", "owner", "modified_by", "docstatus", "idx"]:
         if field in script_data:
             del script_data[field]
     
-    if script_exists and existing_script_name:
+    if existing_script_name and index.is_unchanged("Client Script", existing_script_name, script_data):
+        # Identical to the stored record - skip the save, validation and cache clear
+        summary["client_scripts_unchanged"] += 1
+        return False
+    
+    if existing_script_name:
         # Update existing script
         doc = frappe.get_doc("Client Script", existing_script_name)
         
@@ -397,6 +506,7 @@ def import_client_script(script_data, summary):
                 setattr(doc, key, value)
         
         doc.save(ignore_permissions=True)
+        index.add("Client Script", doc.name, doc.as_dict())
         summary["client_scripts_updated"] += 1
     else:
         # Create new client script
@@ -408,47 +518,32 @@ def import_client_script(script_data, summary):
                 setattr(doc, key, value)
         
         doc.insert(ignore_permissions=True)
+        index.add("Client Script", doc.name, doc.as_dict())
         summary["client_scripts_created"] += 1
     
     # Clear cache
     if script_data.get("dt"):
-        frappe.clear_cache(doctype=script_data["dt"])
+        clear_doctype_cache(script_data["dt"], affected_doctypes)
+    
+    return True
 
-def import_server_script(script_data, summary):
+def import_server_script(script_data, summary, index=None, affected_doctypes=None):
     """Import a Server Script"""
-    # Check if script already exists
-    script_exists = False
-    existing_script_name = None
-    
-    if script_data.get("name"):
-        script_exists = frappe.db.exists("Server Script", script_data["name"])
-        if script_exists:
-            existing_script_name = script_data["name"]
-    
-    # If not found by name, try to find by doctype and script_type
-    filters = {}
-    if not script_exists:
-        # Handle different field names for doctype reference
-        if script_data.get("reference_doctype"):
-            filters["reference_doctype"] = script_data["reference_doctype"]
-        elif script_data.get("dt"):
-            filters["reference_doctype"] = script_data["dt"]
-        
-        if script_data.get("script_type"):
-            filters["script_type"] = script_data["script_type"]
-        
-        if filters:
-            existing_scripts = frappe.get_all("Server Script", filters=filters)
-            if existing_scripts:
-                script_exists = True
-                existing_script_name = existing_scripts[0].name
+    # Match an existing script by name, then by doctype and event, or API method
+    index = index or CustomizationIndex({"Server Script": [script_data]})
+    existing_script_name = index.find("Server Script", script_data)
     
     # Remove system fields
     for field in ["creation", "modified", "owner", "modified_by", "docstatus", "idx"]:
         if field in script_data:
             del script_data[field]
     
-    if script_exists and existing_script_name:
+    if existing_script_name and index.is_unchanged("Server Script", existing_script_name, script_data):
+        # Identical to the stored record - skip the save, validation and cache clear
+        summary["server_scripts_unchanged"] += 1
+        return False
+    
+    if existing_script_name:
         # Update existing script
         doc = frappe.get_doc("Server Script", existing_script_name)
         
@@ -458,6 +553,7 @@ def import_server_script(script_data, summary):
                 setattr(doc, key, value)
         
         doc.save(ignore_permissions=True)
+        index.add("Server Script", doc.name, doc.as_dict())
         summary["server_scripts_updated"] += 1
     else:
         # Create new server script
@@ -469,6 +565,7 @@ def import_server_script(script_data, summary):
                 setattr(doc, key, value)
         
         doc.insert(ignore_permissions=True)
+        index.add("Server Script", doc.name, doc.as_dict())
         summary["server_scripts_created"] += 1
     
     # Clear cache to ensure changes are reflected
@@ -479,4 +576,6 @@ def import_server_script(script_data, summary):
         doctype_to_clear = script_data["dt"]
     
     if doctype_to_clear:
-        frappe.clear_cache(doctype=doctype_to_clear)
\ No newline at end of file
+        clear_doctype_cache(doctype_to_clear, affected_doctypes)
+    
+    return True
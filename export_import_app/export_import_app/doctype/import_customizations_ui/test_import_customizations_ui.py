@@ -1,9 +1,38 @@
 # Copyright (c) 2025, ahmadmohammad96 and Contributors
 # See license.txt
 
+from decimal import Decimal
+
 # import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from export_import_app.export_import_app.doctype.import_customizations_ui.customization_index import (
+	CustomizationIndex,
+	get_content_hash,
+)
+
 
 class TestImportCustomizationsUI(FrappeTestCase):
-	pass
+	def test_content_hash_ignores_storage_differences(self):
+		columns = ["dt", "fieldname", "label", "precision", "width", "hidden"]
+		stored = {"name": "Employee-custom_code", "dt": "Employee", "fieldname": "custom_code",
+			"label": "Code", "precision": None, "width": Decimal("10.000"), "hidden": 0}
+		imported = {"name": "Employee-custom_code-2", "modified": "2025-01-01 00:00:00", "dt": "Employee",
+			"fieldname": "custom_code", "label": "Code", "precision": "", "width": 10, "hidden": 0}
+
+		self.assertEqual(get_content_hash(columns, stored), get_content_hash(columns, imported))
+		self.assertNotEqual(get_content_hash(columns, stored), get_content_hash(columns, dict(imported, hidden=1)))
+
+	def test_server_scripts_without_reference_doctype_do_not_collide(self):
+		index = CustomizationIndex({"Server Script": []})
+		index.add("Server Script", "Nightly Cleanup", {"script_type": "Scheduler Event", "event_frequency": "Daily"})
+		index.add("Server Script", "Get Stock", {"script_type": "API", "api_method": "get_stock"})
+		index.add("Server Script", "Validate Employee", {
+			"script_type": "DocType Event", "reference_doctype": "Employee", "doctype_event": "Before Save"})
+
+		self.assertIsNone(index.find("Server Script", {"name": "Nightly Report", "script_type": "Scheduler Event", "event_frequency": "Daily"}))
+		self.assertIsNone(index.find("Server Script", {"name": "Get Price", "script_type": "API", "api_method": "get_price"}))
+		self.assertEqual(index.find("Server Script", {"name": "Get Stock 2", "script_type": "API", "api_method": "get_stock"}), "Get Stock")
+		self.assertIsNone(index.find("Server Script", {
+			"name": "Notify Employee", "script_type": "DocType Event", "reference_doctype": "Employee", "doctype_event": "After Save"}))
+		self.assertEqual(index.find("Server Script", {"name": "Nightly Cleanup", "script_type": "Scheduler Event"}), "Nightly Cleanup")
@@ -166,6 +166,12 @@ app_license = "mit"
 # 	],
 # }
 
+scheduler_events = {
+	"all": [
+		"export_import_app.export_import_app.doctype.export_customizations_module.test.check_export_part_deadlines"
+	],
+}
+
 # Testing
 # -------
 
@@ -247,6 +253,17 @@ app_license = "mit"
 doc_events = {
     "Export Customizations Module": {
         "validate": "export_import_app.export_import_app.doctype.export_customizations_module.export_customizations_module.validate"
+    },
+    # Keep the cached core/custom DocType classification in step with its sources
+    "DocType": {
+        "on_update": "export_import_app.export_import_app.doctype.export_customizations_module.doctype_classifier.clear_doctype_classification_cache",
+        "after_rename": "export_import_app.export_import_app.doctype.export_customizations_module.doctype_classifier.clear_doctype_classification_cache",
+        "on_trash": "export_import_app.export_import_app.doctype.export_customizations_module.doctype_classifier.clear_doctype_classification_cache"
+    },
+    "Module Def": {
+        "on_update": "export_import_app.export_import_app.doctype.export_customizations_module.doctype_classifier.clear_doctype_classification_cache",
+        "after_rename": "export_import_app.export_import_app.doctype.export_customizations_module.doctype_classifier.clear_doctype_classification_cache",
+        "on_trash": "export_import_app.export_import_app.doctype.export_customizations_module.doctype_classifier.clear_doctype_classification_cache"
     }
 }
 
@@ -262,6 +279,11 @@ fixtures = [
     "Predefined Emails Child Table",
 ]
 
+# Export selections are stored on Export Customizations Module (fixture_selection),
+# so this list is never rewritten at runtime. `bench --site <site> export-selected-fixtures`
+# exports it together with the stored selections (see fixture_selection.get_fixtures);
+# `bench migrate` imports every file in fixtures/ as usual.
+
 # The fixtures that are generated by the export tool will be stored in the standard directory
 # They will be automatically imported when this app is installed on another site
 